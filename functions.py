@@ -10,9 +10,16 @@ import matplotlib.image as mpimg
 import pandas as pd
 import os
 import io
+import sys
+import time
+import json
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+from statistics import NormalDist
 import requests as _req
 from sklearn.preprocessing import StandardScaler, normalize
-from sklearn.metrics.pairwise import cosine_similarity
 
 from matplotlib.colors import Normalize
 from matplotlib.cm import ScalarMappable
@@ -30,6 +37,212 @@ import matplotlib.pyplot as plt
 import numpy as np
 import matplotlib.pyplot as plt
 
+# Fixed log-spaced bins shared by every sketch, so sketches merge by addition
+_NORM_SKETCH_EDGES = np.geomspace(1e-6, 1e6, 2049)
+_NORM_SKETCH_REL_ERR = float(_NORM_SKETCH_EDGES[1] / _NORM_SKETCH_EDGES[0] - 1.0)
+
+
+def build_norm_sketch(evs, min_norm=1e-9):
+    """
+    Mergeable histogram sketch of EV vector norms (> min_norm) for one
+    (batter, length, bowl_kind) block.
+    """
+    vecs = np.asarray(evs, dtype=float).reshape(-1, 2) if len(evs) else np.zeros((0, 2))
+    norms = np.linalg.norm(vecs, axis=1)
+    norms = norms[norms > min_norm]
+    clipped = np.clip(norms, _NORM_SKETCH_EDGES[0], _NORM_SKETCH_EDGES[-1])
+    bins = np.clip(np.searchsorted(_NORM_SKETCH_EDGES, clipped, side="right") - 1,
+                   0, len(_NORM_SKETCH_EDGES) - 2)
+    return {
+        "counts": np.bincount(bins, minlength=len(_NORM_SKETCH_EDGES) - 1).astype(np.int64),
+        "n": int(norms.size),
+        "min": float(norms.min()) if norms.size else np.inf,
+        "max": float(norms.max()) if norms.size else -np.inf,
+    }
+
+
+def merge_norm_sketches(sketches):
+    """Sum any number of norm sketches into one."""
+    sketches = list(sketches)
+    counts = np.zeros(len(_NORM_SKETCH_EDGES) - 1, dtype=np.int64)
+    for sk in sketches:
+        counts += sk["counts"]
+    return {
+        "counts": counts,
+        "n": int(sum(sk["n"] for sk in sketches)),
+        "min": min((sk["min"] for sk in sketches), default=np.inf),
+        "max": max((sk["max"] for sk in sketches), default=-np.inf),
+    }
+
+
+def _sketch_order_stat(sketch, cum, k):
+    """
+    Estimate of the k-th smallest norm (0-based) and its relative error bound.
+
+    The value lies in its bin narrowed by the sketch min/max (widened to them
+    in the clipped end bins); the estimate is interpolated geometrically by
+    position within the bin, so its error is at most that interval's ratio.
+    """
+    n = sketch["n"]
+    if k <= 0:
+        return sketch["min"], 0.0
+    if k >= n - 1:
+        return sketch["max"], 0.0
+
+    last = len(_NORM_SKETCH_EDGES) - 2
+    b = int(np.searchsorted(cum, k, side="right"))
+    before = cum[b - 1] if b > 0 else 0
+    inside = sketch["counts"][b]
+    lo, hi = _NORM_SKETCH_EDGES[b], _NORM_SKETCH_EDGES[b + 1]
+    if b == 0:
+        lo = min(lo, sketch["min"])
+    if b == last:
+        hi = max(hi, sketch["max"])
+    lo, hi = max(lo, sketch["min"]), min(hi, sketch["max"])
+    if hi <= lo:
+        return float(lo), 0.0
+
+    frac = (k - before + 0.5) / inside if inside else 0.5
+    value = float(lo * (hi / lo) ** min(max(frac, 0.0), 1.0))
+    return value, float(hi / lo - 1.0)
+
+
+def sketch_percentile(sketch, percentile):
+    """
+    Approximate np.percentile(norms, percentile) from a sketch.
+
+    The order statistics at floor(rank) and ceil(rank) are estimated inside
+    their own bins and interpolated linearly, as np.percentile does. Returns
+    (value, rel_error) where rel_error bounds the relative error: one log-bin
+    width (~1.4 %) for norms inside the sketch range, 0 at the extremes.
+    """
+    n = sketch["n"]
+    if n == 0:
+        raise ValueError("Norm sketch is empty.")
+    if n == 1 or float(percentile) >= 100:
+        return sketch["max"], 0.0
+
+    rank = min(max(float(percentile), 0.0), 100.0) / 100.0 * (n - 1)   # 0-based, as np.percentile
+    cum = np.cumsum(sketch["counts"])
+    k0 = int(np.floor(rank))
+    k1 = min(k0 + 1, n - 1)
+    v0, e0 = _sketch_order_stat(sketch, cum, k0)
+    if k1 == k0 or rank == k0:
+        return v0, e0
+    v1, e1 = _sketch_order_stat(sketch, cum, k1)
+    # each endpoint is within (1 + e) of its order statistic, so is any convex combination
+    return float(v0 + (rank - k0) * (v1 - v0)), max(e0, e1)
+
+
+def sketch_radius(norm_sketches, lengths, percentile):
+    """Percentile radius for any length combination from {length: sketch}, without pooling vectors."""
+    picked = [norm_sketches[ln] for ln in lengths if ln in norm_sketches]
+    return sketch_percentile(merge_norm_sketches(picked), percentile)
+
+
+def build_ev_norm_sketches(batter_context_metrics, min_norm=1e-9):
+    """
+    Norm sketches for every block of
+    batter_context_metrics[batter][length][bowl_kind]['evs'],
+    keyed (batter, length, bowl_kind).
+    """
+    out = {}
+    for batter, by_len in (batter_context_metrics or {}).items():
+        for ln, by_kind in (by_len or {}).items():
+            for bk, block in (by_kind or {}).items():
+                evs = (block or {}).get("evs", [])
+                out[(batter, ln, bk)] = build_norm_sketch(evs, min_norm=min_norm)
+    return out
+
+
+# Fallback magnitude edges for wagon density bins built from no vectors
+_WAGON_MAG_EDGES = np.concatenate([[0.0], np.geomspace(0.1, 500.0, 64)])
+
+
+def wagon_mag_edges(evs_list, min_norm=1e-9, n_rings=64):
+    """
+    Log-spaced magnitude edges spanning the EV norms (> min_norm) across
+    evs_list, with the innermost ring starting at 0.
+
+    Build every length's bins with the same edges so they can be merged.
+    """
+    norms = []
+    for evs in evs_list:
+        if len(evs):
+            n = np.linalg.norm(np.asarray(evs, dtype=float).reshape(-1, 2), axis=1)
+            norms.append(n[n > min_norm])
+    norms = np.concatenate(norms) if norms else np.zeros(0)
+    if not norms.size:
+        return _WAGON_MAG_EDGES
+    lo, hi = float(norms.min()), float(norms.max())
+    if hi <= lo * (1.0 + 1e-9):
+        hi = lo * 2.0
+    edges = np.geomspace(lo, hi, int(n_rings) + 1)
+    edges[0] = 0.0
+    return edges
+
+
+def build_wagon_bins(evs, min_norm=1e-9, n_angle=72, mag_edges=None):
+    """
+    Angle × magnitude histogram of EV vectors (norm > min_norm) for one length.
+
+    mag_edges defaults to wagon_mag_edges([evs]); pass shared edges from
+    wagon_mag_edges over all lengths to make bins mergeable. Magnitudes beyond
+    the last edge fall in the outermost bin. Bins built with the same
+    n_angle / mag_edges can be added with merge_wagon_bins.
+    """
+    vecs = np.asarray(evs, dtype=float).reshape(-1, 2) if len(evs) else np.zeros((0, 2))
+    if mag_edges is None:
+        edges = wagon_mag_edges([vecs], min_norm=min_norm)
+    else:
+        edges = np.asarray(mag_edges, dtype=float)
+    norms = np.linalg.norm(vecs, axis=1)
+    keep = norms > min_norm
+    vecs, norms = vecs[keep], norms[keep]
+
+    theta = np.arctan2(vecs[:, 1], vecs[:, 0])
+    counts, _, _ = np.histogram2d(
+        theta, np.minimum(norms, edges[-1]),
+        bins=[np.linspace(-np.pi, np.pi, n_angle + 1), edges],
+    )
+    return {"counts": counts.astype(np.int64), "n_angle": int(n_angle), "mag_edges": edges}
+
+
+def merge_wagon_bins(bins_list):
+    """Sum wagon density bins across lengths (all must share n_angle and mag_edges)."""
+    bins_list = list(bins_list)
+    if not bins_list:
+        raise ValueError("No wagon bins to merge.")
+    first = bins_list[0]
+    counts = np.zeros_like(first["counts"])
+    for b in bins_list:
+        if b["n_angle"] != first["n_angle"] or not np.array_equal(b["mag_edges"], first["mag_edges"]):
+            raise ValueError("Wagon bins use different grids and cannot be merged.")
+        counts += b["counts"]
+    return {"counts": counts, "n_angle": first["n_angle"], "mag_edges": first["mag_edges"]}
+
+
+def wagon_density_mesh(bins, radius):
+    """
+    Quad-mesh (X, Y, counts) for bins clipped to radius: rings past the
+    radius fold into the outermost ring, as clipped vectors end on it.
+    """
+    edges = bins["mag_edges"]
+    inner = edges[:-1][edges[:-1] < radius]
+    ring_edges = np.append(inner, radius)
+    n_rings = len(ring_edges) - 1
+
+    ring_of = np.minimum(np.arange(len(edges) - 1), n_rings - 1)
+    fold = np.zeros((len(edges) - 1, n_rings))
+    fold[np.arange(len(edges) - 1), ring_of] = 1.0
+    grid = bins["counts"] @ fold
+
+    theta = np.linspace(-np.pi, np.pi, bins["n_angle"] + 1)
+    X = ring_edges[None, :] * np.cos(theta)[:, None]
+    Y = ring_edges[None, :] * np.sin(theta)[:, None]
+    return X, Y, grid
+
+
 def plot_int_wagons(
     batter,
     lengths,
@@ -45,6 +258,11 @@ def plot_int_wagons(
     quiver_width=0.0016,   # ✅ width as fraction of radius (scales automatically)
     glow=True,
     cap_radius=None,            # optional hard cap if you want (e.g. 40)
+    renderer="quiver",          # "quiver" or "lines" (one path for all vectors, for large samples)
+    max_vectors=20000,          # "lines" only: randomly downsample above this many vectors
+    radius_mode="exact",        # "exact" or "sketch" (merged per-length norm histograms)
+    norm_sketches=None,         # "sketch" only: {length: build_norm_sketch(...)}; built from evs if missing
+    wagon_bins=None,            # "density" only: {length: build_wagon_bins(...)} on shared edges; built from evs if missing
 ):
     """
     Plots ev vectors for a batter × lengths × bowl_kind from batter_context_metrics.
@@ -54,6 +272,11 @@ def plot_int_wagons(
 
     percentile:
       max_magnitude is set to the given percentile of vector norms in the pooled set.
+
+    renderer="lines":
+      all vectors go into a single NaN-separated path; the glow is one extra
+      stroke of that path (overlaps blend once instead of once per vector). Above max_vectors a fixed-seed random
+      subset is drawn; the radius is always taken from the full sample.
     """
 
     # ---------------------------
@@ -96,7 +319,18 @@ def plot_int_wagons(
     if not (0 < p <= 100):
         raise ValueError("percentile must be in (0, 100].")
 
-    max_magnitude = float(np.percentile(norms, p))
+    if radius_mode == "sketch":
+        sketches = dict(norm_sketches or {})
+        for ln in lengths:
+            if ln not in sketches:
+                evs = (source.get(ln, {}) or {}).get("evs", [])
+                sketches[ln] = build_norm_sketch(evs, min_norm=min_norm)
+        max_magnitude, radius_err = sketch_radius(sketches, lengths, p)
+    elif radius_mode == "exact":
+        max_magnitude = float(np.percentile(norms, p))
+        radius_err = 0.0
+    else:
+        raise ValueError("radius_mode must be 'exact' or 'sketch'.")
     if cap_radius is not None:
         max_magnitude = min(max_magnitude, float(cap_radius))
 
@@ -109,13 +343,13 @@ def plot_int_wagons(
     scale = np.minimum(1.0, max_magnitude / (norms + 1e-12))
     clipped = vecs * scale[:, None]
 
+    if renderer not in ("quiver", "lines", "density"):
+        raise ValueError("renderer must be 'quiver', 'lines' or 'density'.")
+
     x = clipped[:, 0]
     y = clipped[:, 1]
     n = len(x)
 
-    origin_x = np.zeros(n)
-    origin_y = np.zeros(n)
-
     # ---------------------------
     # Figure setup (modern)
     # ---------------------------
@@ -149,12 +383,75 @@ def plot_int_wagons(
     # ---------------------------
     
 
-    if glow:
-        for w, a in [
-            (quiver_width * 2.8, 0.08),
-            (quiver_width * 2.0, 0.12),
-            (quiver_width * 1.4, 0.16),
-        ]:
+    glow_layers = [
+        (quiver_width * 2.8, 0.08),
+        (quiver_width * 2.0, 0.12),
+        (quiver_width * 1.4, 0.16),
+    ] if glow else []
+
+    if renderer == "density":
+        bins = dict(wagon_bins or {})
+        missing = [ln for ln in lengths if ln not in bins]
+        if missing:
+            given = [bins[ln] for ln in lengths if ln in bins]
+            if given:
+                edges = given[0]["mag_edges"]
+            else:
+                edges = wagon_mag_edges(
+                    [(source.get(ln, {}) or {}).get("evs", []) for ln in lengths], min_norm=min_norm
+                )
+            for ln in missing:
+                evs = (source.get(ln, {}) or {}).get("evs", [])
+                bins[ln] = build_wagon_bins(evs, min_norm=min_norm, mag_edges=edges)
+        merged = merge_wagon_bins([bins[ln] for ln in lengths if ln in bins])
+        X, Y, grid = wagon_density_mesh(merged, max_magnitude)
+
+        dens_cmap = LinearSegmentedColormap.from_list(
+            "wagon_density",
+            [mcolors.to_rgba(quiver_color, 0.10), mcolors.to_rgba(quiver_color, 1.0)],
+            N=256,
+        )
+        ax.pcolormesh(
+            X, Y, np.ma.masked_equal(grid, 0),
+            cmap=dens_cmap,
+            norm=mcolors.PowerNorm(gamma=0.5, vmin=0, vmax=max(float(grid.max()), 1.0)),
+            shading="flat", edgecolors="none", zorder=3,
+        )
+    elif renderer == "lines":
+        import matplotlib.patheffects as pe
+
+        seg = clipped
+        if max_vectors is not None and n > int(max_vectors):
+            pick = np.random.default_rng(0).choice(n, size=int(max_vectors), replace=False)
+            seg = clipped[np.sort(pick)]
+
+        # One NaN-separated polyline: origin → tip per vector, drawn as a single path
+        coords = np.full((len(seg), 3, 2), np.nan)
+        coords[:, 0, :] = 0.0
+        coords[:, 1, :] = seg
+        coords = coords.reshape(-1, 2)
+
+        # quiver width is a fraction of the axes width; lines want points
+        axes_w_pt = ax.get_position().width * fig.get_figwidth() * 72.0
+        (line,) = ax.plot(
+            coords[:, 0], coords[:, 1],
+            color=quiver_color, alpha=0.95,
+            linewidth=quiver_width * axes_w_pt,
+            solid_capstyle="butt", zorder=3,
+        )
+        if glow_layers:
+            # the three quiver glow passes collapsed into one stroke of their combined alpha
+            glow_alpha = 1.0 - np.prod([1.0 - a for _, a in glow_layers])
+            glow_w = float(np.mean([w for w, _ in glow_layers]))
+            line.set_path_effects([
+                pe.Stroke(linewidth=glow_w * axes_w_pt, foreground=glow_color, alpha=glow_alpha * 0.6),
+                pe.Normal(),
+            ])
+    else:
+        origin_x = np.zeros(n)
+        origin_y = np.zeros(n)
+
+        for w, a in glow_layers:
             ax.quiver(
                 origin_x, origin_y, x, y,
                 angles="xy", scale_units="xy", scale=1,
@@ -163,14 +460,14 @@ def plot_int_wagons(
                 zorder=2
             )
 
-    ax.quiver(
-        origin_x, origin_y, x, y,
-        angles="xy", scale_units="xy", scale=1,
-        color=quiver_color, alpha=0.95,
-        width=quiver_width,
-        headwidth=0, headlength=0, headaxislength=0,
-        zorder=3
-    )
+        ax.quiver(
+            origin_x, origin_y, x, y,
+            angles="xy", scale_units="xy", scale=1,
+            color=quiver_color, alpha=0.95,
+            width=quiver_width,
+            headwidth=0, headlength=0, headaxislength=0,
+            zorder=3
+        )
 
     # ---------------------------
     # Boundary circle
@@ -228,7 +525,8 @@ def plot_int_wagons(
     )
     ax.text(
         0.5, 1.02,
-        f"{', '.join(map(str, lengths))} • {bowl_kind} • p{int(percentile)} radius={max_magnitude:.2f}",
+        f"{', '.join(map(str, lengths))} • {bowl_kind} • p{int(percentile)} radius={max_magnitude:.2f}"
+        + (f" (±{radius_err * 100:.1f}%)" if radius_err else ""),
         transform=ax.transAxes,
         ha="center", va="bottom",
         fontsize=11, color=text_color, alpha=0.90
@@ -238,44 +536,305 @@ def plot_int_wagons(
     return fig
 
 
-def plot_matchups_chart(batter, bowl_kind, matchups_data, kind):
-    try:
-        matchups = matchups_data.get("matchups", {})
-        if not matchups:
-            return None
+# Matchup / variation table (batter × style-or-variation × {metric, balls})
+_MATCHUP_STYLE_KEYS = {
+    'pace bowler': [
+        'RIGHT_ARM_FAST', 'LEFT_ARM_FAST',
+        'RIGHT_ARM_MEDIUM_FAST', 'LEFT_ARM_MEDIUM_FAST',
+        'RIGHT_ARM_MEDIUM', 'LEFT_ARM_MEDIUM',
+    ],
+    'spin bowler': [
+        'LEG_BREAK', 'SLOW_LEFT_ARM', 'OFF_BREAK', 'CHINAMAN',
+    ],
+}
+_VARIATION_PREFIXES = {'pace bowler': 'Pace_', 'spin bowler': 'Spin_'}
+_VARIATION_MIN_BALLS = 10
 
-        if bowl_kind == 'pace bowler':
-            matchup_keys = [
-                'RIGHT_ARM_FAST', 'LEFT_ARM_FAST',
-                'RIGHT_ARM_MEDIUM_FAST', 'LEFT_ARM_MEDIUM_FAST',
-                'RIGHT_ARM_MEDIUM', 'LEFT_ARM_MEDIUM',
-            ]
-        elif bowl_kind == 'spin bowler':
-            matchup_keys = [
-                'LEG_BREAK', 'SLOW_LEFT_ARM', 'OFF_BREAK', 'CHINAMAN',
-            ]
-        else:
-            matchup_keys = list(matchups.keys())
 
-        styles, values, balls_list = [], [], []
-        for style, vals in matchups.items():
-            if style not in matchup_keys:
-                continue
-            eff = vals.get(kind)
-            if eff is None or not isinstance(eff, (int, float)):
+def build_matchup_table(matchup_payloads=None, variation_payloads=None):
+    """
+    Load every batter's matchup and variation payloads into one columnar table.
+
+    Both arguments map batter → payload ({"matchups": {...}} /
+    {"variations": {...}}). Columns are (group, key) pairs, group being
+    "matchups" or "variations". values[b, k, m] holds numeric metric m
+    (NaN when missing or non-numeric) and balls[b, k] the sample size
+    (0 when missing, null, non-numeric or negative).
+
+    Returns {"batters", "row_of", "columns", "col_of", "metrics", "values",
+    "balls", "present"}.
+    """
+    sources = (("matchups", matchup_payloads or {}), ("variations", variation_payloads or {}))
+
+    batters, columns, metrics = {}, {}, {}
+    for group, payloads in sources:
+        for batter, payload in payloads.items():
+            batters.setdefault(batter, None)
+            for key, vals in ((payload or {}).get(group) or {}).items():
+                if not isinstance(vals, dict):
+                    continue
+                columns.setdefault((group, key), None)
+                for m, v in vals.items():
+                    if m != "balls" and isinstance(v, (int, float)):
+                        metrics.setdefault(m, None)
+    batters, columns, metrics = list(batters), list(columns), list(metrics)
+
+    row_of = {b: i for i, b in enumerate(batters)}
+    col_of = {c: j for j, c in enumerate(columns)}
+    met_of = {m: i for i, m in enumerate(metrics)}
+    values = np.full((len(batters), len(columns), len(metrics)), np.nan)
+    balls = np.zeros((len(batters), len(columns)), dtype=np.int64)
+    present = np.zeros((len(batters), len(columns)), dtype=bool)
+
+    for group, payloads in sources:
+        for batter, payload in payloads.items():
+            i = row_of[batter]
+            for key, vals in ((payload or {}).get(group) or {}).items():
+                if not isinstance(vals, dict):
+                    continue
+                j = col_of[(group, key)]
+                present[i, j] = True
+                n_balls = _safe_float(vals.get("balls"))
+                balls[i, j] = int(n_balls) if n_balls > 0 else 0
+                for m, v in vals.items():
+                    if m in met_of and isinstance(v, (int, float)):
+                        values[i, j, met_of[m]] = float(v)
+
+    return {
+        "batters": batters,
+        "row_of": row_of,
+        "columns": columns,
+        "col_of": col_of,
+        "metrics": metrics,
+        "values": values,
+        "balls": balls,
+        "present": present,
+    }
+
+
+def _matchup_columns(table, group, bowl_kind):
+    """Column indices and display names the charts show for a bowl kind."""
+    cols, names = [], []
+    if group == "matchups":
+        keys = _MATCHUP_STYLE_KEYS.get(bowl_kind)
+        for j, (g, key) in enumerate(table["columns"]):
+            if g == group and (keys is None or key in keys):
+                cols.append(j)
+                names.append(key)
+    else:
+        prefix = _VARIATION_PREFIXES.get(bowl_kind)
+        for j, (g, key) in enumerate(table["columns"]):
+            if g != group or (prefix and not key.startswith(prefix)):
                 continue
-            styles.append(style)
-            values.append((float(eff) - 1.0) * 100.0)
-            balls_list.append(int(vals.get("balls", 0)))
+            display_name = key[len(prefix):] if prefix else key
+            if display_name == 'StockBall':
+                display_name = 'StockBall (SLA)'
+            cols.append(j)
+            names.append(display_name)
+    return np.array(cols, dtype=np.int64), names
+
+
+def matchup_bars(table, batter, group, bowl_kind, kind, shrinkage=None):
+    """
+    One batter's chart rows from a matchup table.
+
+    Applies the chart filters (style list or variation prefix, and the
+    minimum ball count for variations), converts `kind` to a percentage
+    effect and sorts descending. With a shrink_matchup_table result as
+    `shrinkage`, effects are the shrunk ones, the variation ball floor is
+    dropped and credible bounds are returned.
+
+    Returns (values, names, balls, intervals) lists; intervals holds
+    (lo, hi) percentages, or is None without shrinkage.
+    """
+    if batter not in table["row_of"] or kind not in table["metrics"]:
+        return [], [], [], None
+    cols, names = _matchup_columns(table, group, bowl_kind)
+    if not len(cols):
+        return [], [], [], None
+
+    i = table["row_of"][batter]
+    m = table["metrics"].index(kind)
+    src = table["values"] if shrinkage is None else shrinkage["mean"]
+    eff = src[i, cols, m]
+    balls = table["balls"][i, cols]
+    keep = table["present"][i, cols] & ~np.isnan(eff)
+    if shrinkage is None and group == "variations":
+        keep &= balls >= _VARIATION_MIN_BALLS
+
+    idx = np.flatnonzero(keep)
+    pct = (eff[idx] - 1.0) * 100.0
+    rows = sorted(zip(pct.tolist(), [names[k] for k in idx], balls[idx].tolist(), idx.tolist()), reverse=True)
+    values = [r[0] for r in rows]
+    labels = [r[1] for r in rows]
+    counts = [r[2] for r in rows]
+    if shrinkage is None:
+        return values, labels, counts, None
+
+    order = [cols[r[3]] for r in rows]
+    lo = (shrinkage["lo"][i, order, m] - 1.0) * 100.0
+    hi = (shrinkage["hi"][i, order, m] - 1.0) * 100.0
+    return values, labels, counts, list(zip(lo.tolist(), hi.tolist()))
+
+
+def _eb_moments(u, d2, w, n_iter=5):
+    """
+    Per-slice regression of squared deviation on 1/balls (E[d2] = tau2 + sigma2 / balls).
+
+    Reweighted by 1 / E[d2]^2, since d2 is roughly chi-square with that
+    variance. Returns (tau2, sigma2, ok).
+    """
+    wt = w.astype(float)
+    cnt = w.sum(axis=0)
+    for _ in range(n_iter + 1):
+        sw = wt.sum(axis=0)
+        safe = np.where(sw > 0, sw, 1)
+        mu_u = (wt * u).sum(axis=0) / safe
+        mu_d = (wt * d2).sum(axis=0) / safe
+        du = np.where(w, u - mu_u, 0)
+        var_u = (wt * du * du).sum(axis=0)
+        cov = (wt * du * np.where(w, d2 - mu_d, 0)).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sigma2 = cov / var_u
+        tau2 = mu_d - sigma2 * mu_u
+        fit = np.maximum(tau2, 0) + np.maximum(sigma2, 0) * u
+        fit = np.where(np.isfinite(fit) & (fit > 0), fit, np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            wt = np.where(w & np.isfinite(fit), 1.0 / fit ** 2, 0.0)
+    ok = (cnt >= 3) & (var_u > 0) & np.isfinite(sigma2) & (sigma2 > 0)
+    return tau2, sigma2, ok
+
+
+def shrink_matchup_table(table, level=0.9, min_batters=5, tau2_floor=1e-4):
+    """
+    Empirical-Bayes shrinkage of every batter's effectiveness, league-wide.
+
+    Per (style/variation, metric) the prior mean is the ball-weighted league
+    mean; the between-batter variance tau2 and per-ball noise sigma2 come
+    from regressing (eff - prior)^2 on 1/balls. Columns with fewer than
+    `min_batters` batters borrow the pooled estimate of their group. Each
+    batter is then shrunk with weight balls / (balls + sigma2 / tau2).
+
+    Returns {"mean", "lo", "hi"} as (batters × columns × metrics) arrays
+    (NaN where unobserved, `level` credible bounds) plus per-column
+    "prior_mean", "tau2", "sigma2" and "prior_balls".
+    """
+    x = table["values"]
+    n = table["balls"].astype(float)[..., None]
+    w = table["present"][..., None] & ~np.isnan(x) & (n > 0)
+    n_b = np.broadcast_to(n, x.shape)
+
+    wn = np.where(w, n_b, 0.0)
+    tot = wn.sum(axis=0)
+    prior = np.where(tot > 0, np.where(w, x * n_b, 0).sum(axis=0) / np.where(tot > 0, tot, 1), np.nan)
+
+    with np.errstate(divide="ignore"):
+        u = np.where(w, 1.0 / n_b, 0.0)
+    d2 = np.where(w, (x - prior) ** 2, 0.0)
+    tau2, sigma2, ok = _eb_moments(u, d2, w)
+    ok &= w.sum(axis=0) >= min_batters
+
+    # pooled fallback per group: stack the group's columns on the batter axis
+    groups = np.array([g for g, _ in table["columns"]], dtype=object)
+    for g in set(groups.tolist()):
+        cols = np.flatnonzero(groups == g)
+        n_met = x.shape[2]
+        pu = u[:, cols].reshape(-1, n_met)
+        pd2 = d2[:, cols].reshape(-1, n_met)
+        pw = w[:, cols].reshape(-1, n_met)
+        p_tau2, p_sigma2, p_ok = _eb_moments(pu, pd2, pw)
+        # nothing estimable at all: treat the raw spread as noise only
+        resid = np.where(pw, pd2 / np.where(pu > 0, pu, 1), np.nan)
+        with np.errstate(all="ignore"):
+            raw = np.nanmedian(np.where(pw.any(axis=0), resid, 0), axis=0)
+        p_sigma2 = np.where(p_ok, p_sigma2, raw)
+        p_tau2 = np.where(p_ok, p_tau2, tau2_floor)
+        sub_ok = ok[cols]
+        tau2[cols] = np.where(sub_ok, tau2[cols], p_tau2)
+        sigma2[cols] = np.where(sub_ok, sigma2[cols], p_sigma2)
+
+    tau2 = np.maximum(np.nan_to_num(tau2, nan=tau2_floor), tau2_floor)
+    sigma2 = np.maximum(np.nan_to_num(sigma2, nan=0.0), 0.0)
+
+    prec = n_b * np.where(sigma2 > 0, 1.0 / np.where(sigma2 > 0, sigma2, 1), np.inf) + 1.0 / tau2
+    with np.errstate(invalid="ignore"):
+        mean = np.where(
+            sigma2 > 0,
+            (x * n_b / np.where(sigma2 > 0, sigma2, 1) + prior / tau2) / prec,
+            x,
+        )
+    sd = np.sqrt(1.0 / prec)
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+
+    mean = np.where(w, mean, np.nan)
+    sd = np.where(w, sd, np.nan)
+    return {
+        "level": level,
+        "mean": mean,
+        "lo": mean - z * sd,
+        "hi": mean + z * sd,
+        "prior_mean": prior,
+        "tau2": tau2,
+        "sigma2": sigma2,
+        "prior_balls": sigma2 / tau2,
+    }
+
+
+def rank_matchups(table, key, kind, group="matchups", min_balls=0, n=10, worst=True, shrinkage=None):
+    """
+    Rank batters on one style / variation column.
+
+    e.g. rank_matchups(table, 'LEFT_ARM_FAST', 'sr_efficiency', min_balls=60)
+    gives the 10 batters with the lowest effect against left-arm fast.
+    With a shrink_matchup_table result as `shrinkage`, ranks use the
+    shrunk effect instead of the raw one.
+
+    Returns a DataFrame (rank, batter, effect_pct, balls) ordered best-first
+    or worst-first, or None if the column or metric is not in the table.
+    """
+    j = table["col_of"].get((group, key))
+    if j is None or kind not in table["metrics"]:
+        return None
+
+    src = table["values"] if shrinkage is None else shrinkage["mean"]
+    eff = src[:, j, table["metrics"].index(kind)]
+    balls = table["balls"][:, j]
+    cand = np.flatnonzero(table["present"][:, j] & ~np.isnan(eff) & (balls >= min_balls))
+    score = eff[cand] if worst else -eff[cand]
+
+    n = min(int(n), len(cand))
+    if n <= 0:
+        return pd.DataFrame(columns=["rank", "batter", "effect_pct", "balls"])
+    if n < len(cand):
+        part = np.argpartition(score, n - 1)[:n]
+    else:
+        part = np.arange(len(cand))
+    part = part[np.argsort(score[part], kind="stable")]
+    rows = cand[part]
+
+    return pd.DataFrame({
+        "rank": np.arange(1, n + 1),
+        "batter": [table["batters"][r] for r in rows],
+        "effect_pct": (eff[rows] - 1.0) * 100.0,
+        "balls": balls[rows],
+    })
+
+
+def plot_matchups_chart(batter, bowl_kind, matchups_data, kind, table=None, shrinkage=None):
+    try:
+        if table is None:
+            if not (matchups_data or {}).get("matchups"):
+                return None
+            table = build_matchup_table({batter: matchups_data})
+            shrinkage = None  # shrinkage arrays are aligned to the table they came from
+
+        values, styles, balls_list, intervals = matchup_bars(
+            table, batter, "matchups", bowl_kind, kind, shrinkage=shrinkage
+        )
 
         if not styles:
             return None
 
-        sorted_triplets = sorted(zip(values, styles, balls_list), reverse=True)
-        values     = [t[0] for t in sorted_triplets]
-        styles     = [t[1] for t in sorted_triplets]
-        balls_list = [t[2] for t in sorted_triplets]
-
         n = len(styles)
         fig, ax = plt.subplots(figsize=(12, max(4.5, n * 1.15 + 2.5)))
         fig.patch.set_alpha(0.0)
@@ -283,6 +842,8 @@ def plot_matchups_chart(batter, bowl_kind, matchups_data, kind):
 
         y_pos   = np.arange(n)
         max_abs = max(abs(v) for v in values) if values else 1.0
+        if intervals:
+            max_abs = max(max_abs, max(max(abs(lo), abs(hi)) for lo, hi in intervals))
         x_limit = max_abs * 1.45
 
         POS_COLOR = "#22c55e"
@@ -305,6 +866,13 @@ def plot_matchups_chart(batter, bowl_kind, matchups_data, kind):
             offset    = x_limit * 0.025
             ha        = "left"  if val >= 0 else "right"
             x_label   = val + offset if val >= 0 else val - offset
+            if intervals:
+                lo, hi = intervals[i]
+                ax.plot([lo, hi], [y, y], color="white", linewidth=1.6,
+                        alpha=0.85, solid_capstyle="butt", zorder=3)
+                ax.plot([lo, lo, np.nan, hi, hi], [y - 0.14, y + 0.14, np.nan, y - 0.14, y + 0.14],
+                        color="white", linewidth=1.6, alpha=0.85, zorder=3)
+                x_label = max(val, hi) + offset if val >= 0 else min(val, lo) - offset
             label_txt = f"+{val:.1f}%" if val >= 0 else f"{val:.1f}%"
 
             ax.text(
@@ -354,7 +922,8 @@ def plot_matchups_chart(batter, bowl_kind, matchups_data, kind):
 
         # ── X-axis
         ax.set_xlabel(
-            "(%, 0 = baseline performance)",
+            "(%, 0 = baseline performance)" if not intervals else
+            f"(%, 0 = baseline performance • shrunk to league prior, {int(round(shrinkage['level'] * 100))}% interval)",
             color="white", fontsize=12, fontweight="bold"
         )
         if kind == 'sr_efficiency':
@@ -389,44 +958,20 @@ def plot_matchups_chart(batter, bowl_kind, matchups_data, kind):
         return None
 
 
-def plot_variations_chart(batter, bowl_kind, variations_data, kind):
+def plot_variations_chart(batter, bowl_kind, variations_data, kind, table=None, shrinkage=None):
     try:
-        variations = variations_data.get("variations", {})
-        if not variations:
-            return None
-
-        if bowl_kind == 'pace bowler':
-            prefix = 'Pace_'
-        elif bowl_kind == 'spin bowler':
-            prefix = 'Spin_'
-        else:
-            prefix = None
-
-        names, values, balls_list = [], [], []
-        for var_name, vals in variations.items():
-            if prefix and not var_name.startswith(prefix):
-                continue
-            balls = int(vals.get('balls', 0))
-            if balls < 10:
-                continue
-            eff = vals.get(kind)
-            if eff is None or not isinstance(eff, (int, float)):
-                continue
-            display_name = var_name[len(prefix):] if prefix else var_name
-            if display_name == 'StockBall':
-                display_name = 'StockBall (SLA)'
-            names.append(display_name)
-            values.append((float(eff) - 1.0) * 100.0)
-            balls_list.append(balls)
-
+        if table is None:
+            if not (variations_data or {}).get("variations"):
+                return None
+            table = build_matchup_table(variation_payloads={batter: variations_data})
+            shrinkage = None  # shrinkage arrays are aligned to the table they came from
+
+        values, names, balls_list, intervals = matchup_bars(
+            table, batter, "variations", bowl_kind, kind, shrinkage=shrinkage
+        )
         if not names:
             return None
 
-        sorted_triplets = sorted(zip(values, names, balls_list), reverse=True)
-        values     = [t[0] for t in sorted_triplets]
-        names      = [t[1] for t in sorted_triplets]
-        balls_list = [t[2] for t in sorted_triplets]
-
         n = len(names)
         fig, ax = plt.subplots(figsize=(12, max(4.5, n * 1.15 + 2.5)))
         fig.patch.set_alpha(0.0)
@@ -434,6 +979,8 @@ def plot_variations_chart(batter, bowl_kind, variations_data, kind):
 
         y_pos   = np.arange(n)
         max_abs = max(abs(v) for v in values) if values else 1.0
+        if intervals:
+            max_abs = max(max_abs, max(max(abs(lo), abs(hi)) for lo, hi in intervals))
         x_limit = max_abs * 1.45
 
         POS_COLOR = "#22c55e"
@@ -453,6 +1000,13 @@ def plot_variations_chart(batter, bowl_kind, variations_data, kind):
             offset    = x_limit * 0.025
             ha        = "left"  if val >= 0 else "right"
             x_label   = val + offset if val >= 0 else val - offset
+            if intervals:
+                lo, hi = intervals[i]
+                ax.plot([lo, hi], [y, y], color="white", linewidth=1.6,
+                        alpha=0.85, solid_capstyle="butt", zorder=3)
+                ax.plot([lo, lo, np.nan, hi, hi], [y - 0.14, y + 0.14, np.nan, y - 0.14, y + 0.14],
+                        color="white", linewidth=1.6, alpha=0.85, zorder=3)
+                x_label = max(val, hi) + offset if val >= 0 else min(val, lo) - offset
             label_txt = f"+{val:.1f}%" if val >= 0 else f"{val:.1f}%"
 
             ax.text(
@@ -496,7 +1050,8 @@ def plot_variations_chart(batter, bowl_kind, variations_data, kind):
         )
 
         ax.set_xlabel(
-            "(%, 0 = baseline performance)",
+            "(%, 0 = baseline performance)" if not intervals else
+            f"(%, 0 = baseline performance • shrunk to league prior, {int(round(shrinkage['level'] * 100))}% interval)",
             color="white", fontsize=12, fontweight="bold"
         )
         if kind == 'sr_efficiency':
@@ -529,6 +1084,117 @@ def plot_variations_chart(batter, bowl_kind, variations_data, kind):
         return None
 
 
+_BALL_SERIES_FIELDS = {
+    "count": ("batter_ith_ball_count", np.int32),
+    "bat_runs": ("batter_ith_ball_raw_runs", np.float32),
+    "ns_runs": ("non_striker_ith_ball_raw_runs", np.float32),
+}
+
+
+def _ball_keys_values(d):
+    """(int ball indices, values) from a string-keyed backend map; bad or negative keys are dropped."""
+    d = d or {}
+    keys = list(d.keys())
+    vals = list(d.values())
+    try:
+        idx = np.array(keys).astype(np.int64) if keys else np.zeros(0, dtype=np.int64)
+        out_vals = np.asarray(vals, dtype=float)
+    except (ValueError, TypeError):
+        pairs = []
+        for k, v in zip(keys, vals):
+            try:
+                pairs.append((int(k), float(v)))
+            except Exception:
+                continue
+        idx = np.array([k for k, _ in pairs], dtype=np.int64)
+        out_vals = np.array([v for _, v in pairs], dtype=float)
+    keep = idx >= 0
+    return idx[keep], out_vals[keep]
+
+
+def _is_ball_series(obj):
+    return isinstance(obj, dict) and "mask" in obj and isinstance(obj["mask"], np.ndarray)
+
+
+def parse_ball_series(data):
+    """
+    Columnar form of one batter × bowl-kind intent payload.
+
+    data: backend dict (or its JSON text) with batter_ith_ball_count,
+    batter_ith_ball_raw_runs and non_striker_ith_ball_raw_runs keyed by ball
+    number as strings. Returns dense arrays indexed by ball number:
+      count (int32), bat_runs / ns_runs (float32, missing = 0) and mask
+      (True where a count was recorded).
+    """
+    if isinstance(data, (str, bytes)):
+        data = json.loads(data)
+    data = data or {}
+
+    parsed = {name: _ball_keys_values(data.get(src)) for name, (src, _) in _BALL_SERIES_FIELDS.items()}
+    size = max((int(idx.max()) + 1 for idx, _ in parsed.values() if len(idx)), default=0)
+
+    series = {}
+    for name, (_, dtype) in _BALL_SERIES_FIELDS.items():
+        idx, vals = parsed[name]
+        arr = np.zeros(size, dtype=dtype)
+        arr[idx] = vals
+        series[name] = arr
+    mask = np.zeros(size, dtype=bool)
+    mask[parsed["count"][0]] = True
+    series["mask"] = mask
+    return series
+
+
+def load_intent_series(batter_stats):
+    """parse_ball_series for every bowl kind of a batter_stats payload (dict or JSON text)."""
+    if isinstance(batter_stats, (str, bytes)):
+        batter_stats = json.loads(batter_stats)
+    return {bk: parse_ball_series(data) for bk, data in (batter_stats or {}).items()}
+
+
+def cumulative_intent_impact(batter_raw_runs, non_striker_raw_runs, counts):
+    """
+    Cumulative raw intent impact along the last axis:
+    cumsum(batter runs/ball − non-striker runs/ball).
+
+    Accepts 1-D series or 2-D (batters × balls) arrays; NaN entries (padding)
+    contribute nothing and stay NaN in the output.
+    """
+    bat = np.asarray(batter_raw_runs, dtype=float)
+    ns = np.asarray(non_striker_raw_runs, dtype=float)
+    cnt = np.asarray(counts, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        per_ball = bat / cnt - ns / cnt
+    missing = np.isnan(per_ball)
+    impact = np.cumsum(np.where(missing, 0.0, per_ball), axis=-1)
+    impact[missing] = np.nan
+    return impact
+
+
+def stable_point_index(impact):
+    """
+    Index of the first ball after which cumulative impact never drops below
+    zero, or -1 if there is none. O(n) via a reverse cumulative minimum.
+
+    impact: 1-D curve (returns an int) or 2-D batters × balls (returns an
+    array); NaN entries are padding and are ignored.
+    """
+    imp = np.asarray(impact, dtype=float)
+    squeeze = imp.ndim == 1
+    imp = np.atleast_2d(imp)
+
+    suffix_min = np.fmin.accumulate(imp[:, ::-1], axis=1)[:, ::-1]
+    ok = (suffix_min >= 0) & ~np.isnan(imp)
+    idx = np.where(ok.any(axis=1), ok.argmax(axis=1), -1)
+    return int(idx[0]) if squeeze else idx
+
+
+def _intent_bowl_key(block, bowl_kind):
+    if bowl_kind in block:
+        return bowl_kind
+    return "pace" if bowl_kind == "pace bowler" else ("spin" if bowl_kind == "spin bowler" else bowl_kind)
+
+
 def plot_intent_impact(
     batter,
     batter_stats,
@@ -538,51 +1204,30 @@ def plot_intent_impact(
     """
     Plot cumulative raw intent impact curve for a single batter
     vs spin or pace.
+
+    batter_stats[bowl_kind] may be the backend dict (string ball keys) or a
+    parse_ball_series result.
     """
 
     batter_block = batter_stats or {}
-    if bowl_kind not in batter_block:
-        mapped = "pace" if bowl_kind == "pace bowler" else ("spin" if bowl_kind == "spin bowler" else bowl_kind)
-        bowl_kind = mapped
+    bowl_kind = _intent_bowl_key(batter_block, bowl_kind)
     if bowl_kind not in batter_block:
         raise ValueError(f"{batter} has no data vs {bowl_kind}")
 
-    data = batter_block[bowl_kind]
+    series = batter_block[bowl_kind]
+    if not _is_ball_series(series):
+        series = parse_ball_series(series)
 
-    def _normalize_ball_indexed_map(d):
-        out = {}
-        for k, v in (d or {}).items():
-            try:
-                ik = int(k)
-            except Exception:
-                continue
-            out[ik] = v
-        return out
-
-    # Backend JSON serializes dict keys to strings; convert back to int indices.
-    cnts = _normalize_ball_indexed_map(data.get("batter_ith_ball_count", {}))
-    raw_bat = _normalize_ball_indexed_map(data.get("batter_ith_ball_raw_runs", {}))
-    raw_ns = _normalize_ball_indexed_map(data.get("non_striker_ith_ball_raw_runs", {}))
-
-    valid = sorted(i for i in cnts if cnts[i] >= min_count)
-    if not valid:
+    valid = np.flatnonzero(series["mask"] & (series["count"] >= min_count))
+    if not len(valid):
         raise ValueError("No points satisfy min_count filter")
 
-    # ── Per-ball expected values
-    raw_brpb = np.array([raw_bat[i] / cnts[i] for i in valid])
-    raw_nrpb = np.array([raw_ns.get(i, 0) / cnts[i] for i in valid])
-
     # ── Cumulative intent impact
-    raw_impact = np.cumsum(raw_brpb - raw_nrpb)
-    def find_stable(impact):
-        idx = next(
-            (k for k, v in enumerate(impact)
-             if v >= 0 and np.all(impact[k:] >= 0)),
-            None
-        )
-        return valid[idx] if idx is not None else None
-
-    raw_stable = find_stable(raw_impact)
+    raw_impact = cumulative_intent_impact(
+        series["bat_runs"][valid], series["ns_runs"][valid], series["count"][valid]
+    )
+    stable_idx = int(stable_point_index(raw_impact))
+    raw_stable = int(valid[stable_idx]) if stable_idx >= 0 else None
 
     # ─────────────────────────────
     # FIGURE SETUP
@@ -665,37 +1310,304 @@ def plot_intent_impact(
     return fig
 
 
-def plot_field_setting(field_data):
+def league_intent_curves(league_stats, bowl_kind="pace", min_count=5):
     """
-    Ultra-modern cricket field visualization with transparent background
-    and sleek design elements
+    Cumulative intent impact for every batter in one padded, vectorized pass.
+
+    league_stats: {batter: batter_stats} as passed to plot_intent_impact
+    (backend dicts or parse_ball_series results).
+    Returns {"batters", "impact" (batters × ball number, NaN where a ball
+    fails min_count), "stable" (ball number or -1), "bands" (p10/p50/p90 per
+    ball number), "n" (batters with data per ball)}.
     """
-    LIMIT = 400
-    THIRTY_YARD_RADIUS_M = LIMIT/2 - 15
-    batter_origin = np.array([0.0, 50.0])
+    batters, series = [], []
+    for batter, block in (league_stats or {}).items():
+        block = block or {}
+        key = _intent_bowl_key(block, bowl_kind)
+        if key not in block:
+            continue
+        ser = block[key]
+        batters.append(batter)
+        series.append(ser if _is_ball_series(ser) else parse_ball_series(ser))
+
+    width = max((len(ser["mask"]) for ser in series), default=0)
+    count = np.zeros((len(series), width))
+    bat = np.zeros((len(series), width))
+    ns = np.zeros((len(series), width))
+    valid = np.zeros((len(series), width), dtype=bool)
+    for r, ser in enumerate(series):
+        n = len(ser["mask"])
+        count[r, :n] = ser["count"]
+        bat[r, :n] = ser["bat_runs"]
+        ns[r, :n] = ser["ns_runs"]
+        valid[r, :n] = ser["mask"] & (ser["count"] >= min_count)
+
+    count[~valid] = np.nan
+    impact = cumulative_intent_impact(bat, ns, count)
+    stable = stable_point_index(impact) if len(series) else np.zeros(0, dtype=int)
+
+    n_per_ball = valid.sum(axis=0)
+    bands = np.full((3, width), np.nan)
+    has = n_per_ball > 0
+    if has.any():
+        bands[:, has] = np.nanpercentile(impact[:, has], [10, 50, 90], axis=0)
+
+    return {
+        "batters": batters,
+        "row_of": {b: i for i, b in enumerate(batters)},
+        "impact": impact,
+        "stable": stable,
+        "bands": {"p10": bands[0], "p50": bands[1], "p90": bands[2]},
+        "n": n_per_ball,
+    }
 
-    def point_on_field_circle(angle_deg, radius):
-        """Project an angle ray from the batter's standing point to a field circle."""
-        ang_rad = np.deg2rad(angle_deg)
-        direction = np.array([np.sin(ang_rad), np.cos(ang_rad)], dtype=float)
 
-        origin_dot_dir = float(np.dot(batter_origin, direction))
-        origin_norm_sq = float(np.dot(batter_origin, batter_origin))
-        discriminant = origin_dot_dir ** 2 - (origin_norm_sq - radius ** 2)
+def plot_intent_impact_vs_league(
+    batter,
+    league_stats,
+    bowl_kind="pace",
+    min_count=5,
+    min_batters=10,
+    curves=None,
+):
+    """
+    Batter's cumulative intent impact against league p10–p90 / p50 bands.
 
-        if discriminant < 0:
-            return radius * direction
+    curves: optional league_intent_curves(...) result to reuse across batters.
+    Bands are drawn only at ball numbers where at least min_batters batters
+    have data.
+    """
+    if curves is None:
+        curves = league_intent_curves(league_stats, bowl_kind, min_count)
+    row = curves["row_of"].get(batter)
+    if row is None:
+        raise ValueError(f"{batter} has no data vs {bowl_kind}")
 
-        sqrt_discriminant = np.sqrt(discriminant)
-        t_candidates = [
-            -origin_dot_dir + sqrt_discriminant,
-            -origin_dot_dir - sqrt_discriminant,
-        ]
-        t = max((candidate for candidate in t_candidates if candidate >= 0), default=None)
-        if t is None:
-            return radius * direction
+    impact = curves["impact"][row]
+    balls = np.flatnonzero(~np.isnan(impact))
+    if not len(balls):
+        raise ValueError("No points satisfy min_count filter")
+    stable = int(curves["stable"][row])
+
+    band_x = np.flatnonzero(curves["n"] >= min_batters)
+    bands = curves["bands"]
+    kind_label = _intent_bowl_key({}, bowl_kind)
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    fig.patch.set_alpha(0.0)
+    ax.patch.set_alpha(0.0)
+
+    if len(band_x):
+        ax.fill_between(band_x, bands["p10"][band_x], bands["p90"][band_x],
+                        color="#38bdf8", alpha=0.16, linewidth=0, zorder=1,
+                        label="League p10–p90")
+        ax.plot(band_x, bands["p50"][band_x], color="#38bdf8", linewidth=2,
+                linestyle="--", alpha=0.9, zorder=2, label="League median")
+
+    for lw, alpha in [(10, 0.06), (7, 0.10), (5, 0.14)]:
+        ax.plot(balls, impact[balls], color="#ff9100", linewidth=lw,
+                alpha=alpha, solid_capstyle="round", zorder=3)
+    ax.plot(balls, impact[balls], color="#ff9100", linewidth=2.8, zorder=4, label=batter)
+
+    ax.axhline(0, color="white", linestyle="--", linewidth=1.6, alpha=0.8, zorder=1)
+
+    ax.set_xlabel("Balls Faced", fontsize=13, fontweight="bold", color="white")
+    ax.set_ylabel("Cumulative Intent Impact", fontsize=13, fontweight="bold", color="white")
+    ax.set_title(
+        f"Intent Impact vs League — {batter} vs {kind_label.capitalize()}",
+        fontsize=15, fontweight="bold", color="white", pad=14
+    )
+
+    legend = ax.legend(loc="upper left", facecolor="#1a1a1a", edgecolor="white",
+                       framealpha=0.9, fontsize=10, labelcolor="white")
+    legend.get_frame().set_linewidth(1.5)
+
+    ax.grid(True, linestyle="--", alpha=0.15)
+    ax.tick_params(colors="white", labelsize=11)
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+
+    league_stable = curves["stable"][curves["stable"] >= 0]
+    median_stable = f"{np.median(league_stable):.0f}" if len(league_stable) else "None"
+    summary = (f"Minimum balls for positive intent impact: {stable if stable >= 0 else None}"
+               f"  •  League median: {median_stable}")
+    fig.text(
+        0.5, -0.05, summary,
+        ha="center", va="center", fontsize=11, color="white", fontweight="bold",
+        bbox=dict(facecolor="#1a1a1a", alpha=0.9, boxstyle="round,pad=0.6",
+                  edgecolor="white", linewidth=2)
+    )
+    plt.tight_layout()
+    return fig
+
+
+_FIELD_LIMIT = 400
+_FIELD_THIRTY_YARD_RADIUS = _FIELD_LIMIT / 2 - 15
+_FIELD_BATTER_ORIGIN = (0.0, 50.0)
+
+
+def project_to_field_circle(angles_deg, radius, batter_origin=_FIELD_BATTER_ORIGIN):
+    """
+    Project rays at angles_deg (0° = straight, clockwise) from the batter's
+    standing point onto a field circle of the given radius centred at (0, 0).
+
+    angles_deg may have any shape (e.g. settings × fielders); returns an array
+    of shape angles.shape + (2,) with x, y. Rays that miss the circle fall
+    back to radius × direction from the centre.
+    """
+    ang = np.deg2rad(np.asarray(angles_deg, dtype=float))
+    direction = np.stack([np.sin(ang), np.cos(ang)], axis=-1)
+    origin = np.asarray(batter_origin, dtype=float)
+
+    origin_dot_dir = direction @ origin
+    disc = origin_dot_dir ** 2 - (origin @ origin - np.square(radius))
+    sqrt_disc = np.sqrt(np.maximum(disc, 0.0))
+
+    t_far = -origin_dot_dir + sqrt_disc
+    t_near = -origin_dot_dir - sqrt_disc
+    t = np.where(t_far >= 0, t_far, t_near)        # largest non-negative root
+    hit = (disc >= 0) & (t >= 0)
+
+    on_circle = origin + t[..., None] * direction
+    fallback = np.asarray(radius, dtype=float)[..., None] * direction
+    return np.where(hit[..., None], on_circle, fallback)
+
+
+def _angular_distance(a, b):
+    return np.abs((np.asarray(a, dtype=float) - np.asarray(b, dtype=float) + 180.0) % 360.0 - 180.0)
+
+
+def _place_fielders(coverage, value, n_fielders, max_iter):
+    """
+    Greedy max-coverage placement followed by 1-swap local search.
+
+    coverage: (candidates × sectors) kernel in [0, 1]; value: sector weights.
+    Returns (chosen candidate indices, covered value).
+    """
+    n_cand = coverage.shape[0]
+    n_fielders = min(int(n_fielders), n_cand)
+    chosen = []
+    cover = np.zeros(coverage.shape[1])
+    for _ in range(n_fielders):
+        gain = (np.maximum(coverage, cover) - cover) @ value
+        gain[chosen] = -np.inf
+        j = int(np.argmax(gain))
+        chosen.append(j)
+        cover = np.maximum(cover, coverage[j])
+
+    best = float(cover @ value)
+    for _ in range(max_iter):
+        improved = False
+        for i in range(len(chosen)):
+            others = chosen[:i] + chosen[i + 1:]
+            base = coverage[others].max(axis=0) if others else np.zeros(coverage.shape[1])
+            totals = np.maximum(coverage, base) @ value
+            totals[others] = -np.inf
+            j = int(np.argmax(totals))
+            if totals[j] > best + 1e-12:
+                chosen[i] = j
+                best = float(totals[j])
+                improved = True
+        if not improved:
+            break
+    return chosen, best
+
+
+def optimize_field_setting(
+    theta_centers,
+    ev_run,
+    ev_bd,
+    n_inside=5,
+    n_outside=4,
+    *,
+    step=5,
+    inside_width=20.0,
+    outside_width=25.0,
+    max_iter=20,
+):
+    """
+    Place fielders from sector EV (e.g. the output of aggregate_sector_ev).
+
+    Infielders are placed to cover running EV (ev_run) and outfielders to
+    cover boundary EV (ev_bd). A fielder at angle a covers a sector at
+    angular distance d with weight max(0, 1 - d / width); a sector counts its
+    best cover only, so stacking fielders earns nothing. Candidate angles are
+    every `step` degrees; placement is greedy plus 1-swap local search.
+
+    Returns a plot_field_setting-compatible dict
+    (infielder_positions / outfielder_positions / special_fielders) with the
+    covered run and boundary EV under "score".
+    """
+    theta = np.asarray(theta_centers, dtype=float) % 360
+    run = np.clip(np.nan_to_num(np.asarray(ev_run, dtype=float)), 0, None)
+    bd = np.clip(np.nan_to_num(np.asarray(ev_bd, dtype=float)), 0, None)
+    if not len(theta):
+        raise ValueError("No sector EV to optimize against.")
+
+    candidates = np.arange(0, 360, step, dtype=float)
+    dist = _angular_distance(candidates[:, None], theta[None, :])
+    cover_in = np.clip(1.0 - dist / inside_width, 0.0, 1.0)
+    cover_out = np.clip(1.0 - dist / outside_width, 0.0, 1.0)
+
+    inside, run_score = _place_fielders(cover_in, run, n_inside, max_iter)
+    outside, bd_score = _place_fielders(cover_out, bd, n_outside, max_iter)
+    inside = sorted(inside)
+    outside = sorted(outside)
+
+    def _as_angle(j):
+        a = candidates[j]
+        return int(a) if float(a).is_integer() else float(a)
+
+    def _contribution(idx, cover, value):
+        # value only this fielder provides: total minus total without it
+        out = []
+        for k in range(len(idx)):
+            others = idx[:k] + idx[k + 1:]
+            base = cover[others].max(axis=0) if others else np.zeros(cover.shape[1])
+            out.append(float(np.maximum(base, cover[idx[k]]) @ value - base @ value))
+        return out
+
+    special = {}
+    if inside:
+        wall = inside[int(np.argmax(_contribution(inside, cover_in, run)))]
+        special["30_yard_wall"] = _as_angle(wall)
+    if outside:
+        contrib = _contribution(outside, cover_out, bd)
+        superfielder = outside[int(np.argmax(contrib))]
+        special["superfielder"] = _as_angle(superfielder)
+
+        remaining = [j for j in outside if j != superfielder]
+        if remaining:
+            # sprinter: the outfielder with the widest arc to patrol between neighbours
+            angs = np.sort(candidates[outside])
+            gaps = np.diff(np.append(angs, angs[0] + 360))
+            arc = {a: gaps[i] + gaps[i - 1] for i, a in enumerate(angs)}
+            sprinter = max(remaining, key=lambda j: arc[candidates[j]])
+            special["sprinter"] = _as_angle(sprinter)
+            remaining = [j for j in remaining if j != sprinter]
+        if remaining and bd.any():
+            hot = theta[int(np.argmax(bd))]
+            catcher = min(remaining, key=lambda j: float(_angular_distance(candidates[j], hot)))
+            special["catcher"] = _as_angle(catcher)
+
+    return {
+        "infielder_positions": [_as_angle(j) for j in inside],
+        "outfielder_positions": [_as_angle(j) for j in outside],
+        "special_fielders": special,
+        "score": {"ev_run": run_score, "ev_bd": bd_score},
+    }
 
-        return batter_origin + t * direction
+
+def plot_field_setting(field_data):
+    """
+    Ultra-modern cricket field visualization with transparent background
+    and sleek design elements
+    """
+    LIMIT = _FIELD_LIMIT
+    THIRTY_YARD_RADIUS_M = _FIELD_THIRTY_YARD_RADIUS
+
+    inside_xy = project_to_field_circle(field_data['infielder_positions'], THIRTY_YARD_RADIUS_M)
+    outside_xy = project_to_field_circle(field_data['outfielder_positions'], LIMIT)
 
     # Create figure with TRANSPARENT background
     fig, ax = plt.subplots(figsize=(10, 10))
@@ -789,7 +1701,7 @@ def plot_field_setting(field_data):
         label = f"I{idx+1}"
         infielder_labels[angle] = label
 
-        x_pos, y_pos = point_on_field_circle(angle, THIRTY_YARD_RADIUS_M)
+        x_pos, y_pos = inside_xy[idx]
         
         if is_wall:
             # 30-Yard Wall - Red hexagon with glow
@@ -863,7 +1775,7 @@ def plot_field_setting(field_data):
         label = f"O{idx+1}"
         outfielder_labels[angle] = label
 
-        x_pos, y_pos = point_on_field_circle(angle, LIMIT)
+        x_pos, y_pos = outside_xy[idx]
         
         # Determine special fielder types with modern colors
         if angle == superfielder_angle:
@@ -1053,83 +1965,168 @@ def plot_field_setting(field_data):
     return fig, infielder_labels, outfielder_labels
 
 
-def plot_sector_ev_heatmap(
-    ev_dict, 
-    batter_name, 
-    selected_lengths, 
-    bowl_kind,
-    length_dict,
-    LIMIT=350, 
-    THIRTY_YARD_RADIUS_M=171.25 * 350 / 500
-):
+# Length-weighted aggregation ({length: {key: value}} → {key: ball-weighted mean})
+def stack_lengths(per_length, selected_lengths, field=None):
     """
-    Combined polar heatmap with modern design and transparent background:
-    - Inner sector (≤30-yard): running EV (ev_run)
-    - Outer sector (>30-yard): boundary EV (ev_bd)
-    Both use a common color scale for consistent intensity interpretation.
+    Dense (lengths × keys) view of per-length keyed values.
+
+    per_length maps length → {key: value} (or None). With `field`, only
+    dict-valued entries count as keys and their `field` item is used.
+    Rows follow selected_lengths (repeats included); keys are the union
+    over all rows, sorted when comparable.
+
+    Returns (keys, values, present) — values is float64 with 0 where a key
+    is missing for a length, present is the matching bool mask.
     """
+    rows = []
+    keys = {}
+    for ln in selected_lengths:
+        per = per_length.get(ln) if per_length else None
+        if not isinstance(per, dict):
+            per = {}
+        if field is not None:
+            per = {k: (v.get(field, 0) or 0) for k, v in per.items() if isinstance(v, dict)}
+        rows.append(per)
+        for k in per:
+            keys.setdefault(k, None)
+
+    keys = list(keys)
     try:
-        # Normalize selected_lengths to a list
-        if isinstance(selected_lengths, (str, tuple)):
-            sel_lens = [selected_lengths] if isinstance(selected_lengths, str) else list(selected_lengths)
-        else:
-            sel_lens = list(selected_lengths)
-        n_lens = len(sel_lens)
-        band_width = 15
+        keys.sort()
+    except TypeError:
+        pass
+
+    col = {k: j for j, k in enumerate(keys)}
+    values = np.zeros((len(rows), len(keys)))
+    present = np.zeros((len(rows), len(keys)), dtype=bool)
+    for i, per in enumerate(rows):
+        if not per:
+            continue
+        idx = [col[k] for k in per]
+        values[i, idx] = [float(v) for v in per.values()]
+        present[i, idx] = True
+    return keys, values, present
 
-        # Collect all theta centers across selected lengths
-        all_theta = set()
-        per_len_dfs = {}
-        for ln in sel_lens:
-            try:
-                df = ev_dict.get(ln)
-                if df is None:
-                    # missing length/bowl kind -> will be treated as zeros
-                    per_len_dfs[ln] = None
-                else:
-                    per_len_dfs[ln] = df.copy()
-                    all_theta.update(df['theta_center_deg'].values % 360)
-            except Exception:
-                per_len_dfs[ln] = None
 
-        if len(all_theta) == 0:
-            st.warning('No sector EV data available for the selected lengths.')
-            return None
+def length_weighted_mean(per_length, selected_lengths, length_dict, *, field=None, missing="zero"):
+    """
+    Ball-weighted mean of keyed values across lengths, as one dot product.
 
-        all_theta = sorted(all_theta)
-        theta_centers = np.array(all_theta)
-        # Build aggregated arrays (average across lengths; missing treated as zero)
-        agg_ev_run = []
-        agg_ev_bd = []
+    per_length is either {length: {key: value}} or an already stacked
+    (keys, values) pair with one values row per selected length, where NaN
+    marks a missing key; values may carry trailing channel axes, which are
+    averaged together.
 
-        for theta in theta_centers:
-            run_num = 0.0
-            bd_num = 0.0
-            denom = 0.0
+    missing="zero" counts a key absent from a length as 0 (every length with
+    balls is in the denominator); missing="skip" drops that length from the
+    key's denominator instead. Lengths with no balls never contribute.
 
-            for ln in sel_lens:
-                balls = length_dict.get(ln, 0)
+    Returns {key: mean}; keys with no weight at all map to 0.0. With channel
+    axes each mean is an array over the channels.
+    """
+    if missing not in ("zero", "skip"):
+        raise ValueError(f"Unknown missing mode: {missing}")
+
+    if isinstance(per_length, tuple):
+        keys, values = per_length
+        values = np.asarray(values, dtype=float)
+        present = ~np.isnan(values)
+        values = np.where(present, values, 0.0)
+    else:
+        keys, values, present = stack_lengths(per_length, selected_lengths, field=field)
+    if not len(keys):
+        return {}
 
-                if balls == 0:
-                    continue
+    weights = np.array([float(length_dict.get(ln, 0) or 0) for ln in selected_lengths])
+    live = weights != 0
+    weights, values, present = weights[live], values[live], present[live]
 
-                df = per_len_dfs.get(ln)
-                if df is None:
-                    continue
+    if missing == "zero":
+        denom = np.full(values.shape[1:], weights.sum())
+    else:
+        denom = np.tensordot(weights, present, axes=1)
+    num = np.tensordot(weights, values, axes=1)
+    safe = np.where(denom > 0, denom, 1.0)
+    means = np.where(denom > 0, num / safe, 0.0)
+    return dict(zip(list(keys), means.tolist() if means.ndim == 1 else list(means)))
 
-                row = df.loc[df['theta_center_deg'] % 360 == theta]
-                if row.empty:
-                    continue
 
-                run_num += float(row['ev_run'].values[0]) * balls
-                bd_num += float(row['ev_bd'].values[0]) * balls
-                denom += balls
+def aggregate_sector_ev(ev_dict, selected_lengths, length_dict):
+    """
+    Ball-weighted sector EV across lengths, without any plotting.
+
+    Stacks each length's ev_run / ev_bd frame onto one shared, sorted theta
+    grid (NaN where a length lacks a sector) and reduces both with a single
+    length_weighted_mean call. Missing sectors are left out of that sector's
+    denominator.
+
+    Returns (theta_centers, ev_run, ev_bd) as float arrays; all three are
+    empty when no selected length has sector data.
+    """
+    if isinstance(selected_lengths, (str, tuple)):
+        sel_lens = [selected_lengths] if isinstance(selected_lengths, str) else list(selected_lengths)
+    else:
+        sel_lens = list(selected_lengths)
+
+    per_length = {}
+    for ln in sel_lens:
+        df = ev_dict.get(ln)
+        if df is None or ln in per_length:
+            continue
+        try:
+            theta = np.asarray(df['theta_center_deg'].values, dtype=float) % 360
+            ev = np.column_stack([np.asarray(df['ev_run'].values, dtype=float),
+                                  np.asarray(df['ev_bd'].values, dtype=float)])
+        except Exception:
+            continue
+        # first row wins for a repeated sector, matching a .loc[...].values[0] lookup
+        theta, first = np.unique(theta, return_index=True)
+        per_length[ln] = (theta, ev[first])
+
+    if not per_length:
+        empty = np.array([], dtype=float)
+        return empty, empty, empty
+
+    theta_centers = np.unique(np.concatenate([t for t, _ in per_length.values()]))
+    values = np.full((len(sel_lens), len(theta_centers), 2), np.nan)
+    for i, ln in enumerate(sel_lens):
+        if ln in per_length:
+            theta, ev = per_length[ln]
+            values[i, np.searchsorted(theta_centers, theta)] = ev
+
+    means = length_weighted_mean((theta_centers, values), sel_lens, length_dict, missing='skip')
+    ev = np.array(list(means.values()), dtype=float).reshape(-1, 2)
+    return theta_centers, ev[:, 0], ev[:, 1]
+
+
+def plot_sector_ev_heatmap(
+    ev_dict, 
+    batter_name, 
+    selected_lengths, 
+    bowl_kind,
+    length_dict,
+    LIMIT=350, 
+    THIRTY_YARD_RADIUS_M=171.25 * 350 / 500
+):
+    """
+    Combined polar heatmap with modern design and transparent background:
+    - Inner sector (≤30-yard): running EV (ev_run)
+    - Outer sector (>30-yard): boundary EV (ev_bd)
+    Both use a common color scale for consistent intensity interpretation.
+    """
+    try:
+        # Normalize selected_lengths to a list
+        if isinstance(selected_lengths, (str, tuple)):
+            sel_lens = [selected_lengths] if isinstance(selected_lengths, str) else list(selected_lengths)
+        else:
+            sel_lens = list(selected_lengths)
+        band_width = 15
 
-            agg_ev_run.append(run_num / denom if denom > 0 else 0.0)
-            agg_ev_bd.append(bd_num / denom if denom > 0 else 0.0)
+        theta_centers, ev_run, ev_bd = aggregate_sector_ev(ev_dict, sel_lens, length_dict)
 
-        ev_run = np.array(agg_ev_run)
-        ev_bd = np.array(agg_ev_bd)
+        if len(theta_centers) == 0:
+            st.warning('No sector EV data available for the selected lengths.')
+            return None
 
         # Common normalization across both datasets
         all_vals = np.concatenate([ev_bd, ev_run])
@@ -1322,9 +2319,122 @@ def plot_sector_ev_heatmap(
         return None
 
 
-def create_zone_strength_table(dict_360, batter_name, selected_lengths, bowl_kind, length_dict, kind):
+# Zone share cube (length × run class × zone × kind), reduced per length selection
+_ZONE_RUN_CLASSES = ('overall', 'running', 'boundary')
+_ZONE_NAMES = ('Straight', 'Leg', 'Off', 'Behind')
+_ZONE_PREFIXES = ('st_', 'leg_', 'off_', 'bk_')
+
+
+def build_zone_cube(dict_360, batter_name=None, kinds=None):
+    """
+    Precompute a batter's zone runs as one dense cube.
+
+    values[l, r, z, k] holds the `{zone}_{kind}` entry of dict_360[length][run
+    class] and totals[l, r] its total_runs (missing entries are 0). Kinds
+    default to every suffix found after a zone prefix.
+
+    Returns {"batter", "lengths", "kinds", "values", "totals"} with float32
+    arrays; reduce it with zone_cube_shares.
+    """
+    lengths = list(dict_360 or {})
+    if kinds is None:
+        found = set()
+        for ln in lengths:
+            for rc in _ZONE_RUN_CLASSES:
+                per = (dict_360.get(ln) or {}).get(rc) or {}
+                for key in per:
+                    for prefix in _ZONE_PREFIXES:
+                        if isinstance(key, str) and key.startswith(prefix) and len(key) > len(prefix):
+                            found.add(key[len(prefix):])
+        kinds = sorted(found)
+    kinds = list(kinds)
+
+    values = np.zeros((len(lengths), len(_ZONE_RUN_CLASSES), len(_ZONE_PREFIXES), len(kinds)), dtype=np.float32)
+    totals = np.zeros((len(lengths), len(_ZONE_RUN_CLASSES)), dtype=np.float32)
+    for i, ln in enumerate(lengths):
+        for r, rc in enumerate(_ZONE_RUN_CLASSES):
+            per = (dict_360.get(ln) or {}).get(rc)
+            if not per:
+                continue
+            totals[i, r] = per.get('total_runs', 0) or 0
+            for z, prefix in enumerate(_ZONE_PREFIXES):
+                for k, kind in enumerate(kinds):
+                    values[i, r, z, k] = per.get(f'{prefix}{kind}', 0) or 0
+
+    return {
+        "batter": batter_name,
+        "lengths": lengths,
+        "kinds": kinds,
+        "values": values,
+        "totals": totals,
+    }
+
+
+def zone_cube_shares(cube, selected_lengths, length_dict, kind):
+    """
+    Zone percentages of total runs for a length selection, from a zone cube.
+
+    Ball weights are folded onto the cube's length axis (repeats add up) and
+    applied with one contraction; the weighted-mean denominator cancels in
+    the share. Lengths missing from the cube add nothing.
+
+    Returns {run_class: {zone: pct}} as create_zone_strength_table draws it.
     """
-    Clean stacked bar chart showing zone distributions across run classes
+    if isinstance(selected_lengths, (str, tuple)):
+        sel_lens = [selected_lengths] if isinstance(selected_lengths, str) else list(selected_lengths)
+    else:
+        sel_lens = list(selected_lengths)
+
+    row_of = {ln: i for i, ln in enumerate(cube["lengths"])}
+    weights = np.zeros(len(cube["lengths"]))
+    for ln in sel_lens:
+        if ln in row_of:
+            weights[row_of[ln]] += float(length_dict.get(ln, 0) or 0)
+
+    totals = weights @ cube["totals"].astype(float)
+    if kind in cube["kinds"]:
+        k = list(cube["kinds"]).index(kind)
+        zone_runs = np.tensordot(weights, cube["values"][..., k].astype(float), axes=1)
+    else:
+        zone_runs = np.zeros((len(_ZONE_RUN_CLASSES), len(_ZONE_PREFIXES)))
+
+    safe = np.where(totals != 0, totals, 1.0)[:, None]
+    pct = np.where(totals[:, None] != 0, zone_runs / safe * 100, 0.0)
+    return {
+        rc: dict(zip(_ZONE_NAMES, pct[r].tolist()))
+        for r, rc in enumerate(_ZONE_RUN_CLASSES)
+    }
+
+
+def save_zone_cube(cube, path):
+    """Write a zone cube to a single compressed .npz."""
+    np.savez_compressed(
+        path,
+        batter=np.array("" if cube.get("batter") is None else str(cube["batter"])),
+        lengths=np.array([str(ln) for ln in cube["lengths"]]),
+        kinds=np.array([str(k) for k in cube["kinds"]]),
+        values=cube["values"],
+        totals=cube["totals"],
+    )
+
+
+def load_zone_cube(path):
+    """Read a zone cube written by save_zone_cube."""
+    with np.load(path, allow_pickle=False) as npz:
+        return {
+            "batter": str(npz["batter"]) or None,
+            "lengths": npz["lengths"].tolist(),
+            "kinds": npz["kinds"].tolist(),
+            "values": npz["values"],
+            "totals": npz["totals"],
+        }
+
+
+def create_zone_strength_table(dict_360, batter_name, selected_lengths, bowl_kind, length_dict, kind, cube=None):
+    """
+    Clean stacked bar chart showing zone distributions across run classes.
+    Pass a build_zone_cube / load_zone_cube result as `cube` to skip
+    re-aggregating dict_360.
     """
     try:
         # Normalize selected_lengths to list
@@ -1333,55 +2443,32 @@ def create_zone_strength_table(dict_360, batter_name, selected_lengths, bowl_kin
         else:
             sel_lens = list(selected_lengths)
 
-        # Aggregate data across lengths
-        run_classes = ['overall', 'running', 'boundary']
-        aggregated = {rc: {} for rc in run_classes}
-        
-        for rc in run_classes:
-            keys_union = set()
-            per_len_data = {}
-            
-            for ln in sel_lens:
-                try:
-                    per = dict_360.get(ln, {}).get(rc)
-                    per_len_data[ln] = per
-                    if per:
-                        keys_union.update(per.keys())
-                except Exception:
-                    per_len_data[ln] = None
-            
-            # Build averaged data
-            for key in keys_union:
-                num = 0.0
-                denom = 0.0
-
-                for ln in sel_lens:
-                    balls = length_dict.get(ln, 0)
-
-                    if balls == 0:
-                        continue
-
-                    per = per_len_data.get(ln)
-                    val = per.get(key, 0.0) if per else 0.0
-
-                    num += val * balls
-                    denom += balls
+        run_classes = list(_ZONE_RUN_CLASSES)
 
-                aggregated[rc][key] = num / denom if denom > 0 else 0.0
+        if cube is not None:
+            all_zones = zone_cube_shares(cube, sel_lens, length_dict, kind)
+        else:
+            # Aggregate data across lengths
+            aggregated = {
+                rc: length_weighted_mean(
+                    {ln: (dict_360.get(ln) or {}).get(rc) for ln in sel_lens},
+                    sel_lens, length_dict,
+                )
+                for rc in run_classes
+            }
 
+            # Calculate zone percentages for each run class
+            all_zones = {}
+            for rc in run_classes:
+                data = aggregated[rc]
+                total = data.get('total_runs', 0)
 
-        # Calculate zone percentages for each run class
-        all_zones = {}
-        for rc in run_classes:
-            data = aggregated[rc]
-            total = data.get('total_runs', 0)
-            
-            all_zones[rc] = {
-                'Straight': (data.get(f'st_{kind}', 0) / total * 100) if total else 0,
-                'Leg': (data.get(f'leg_{kind}', 0) / total * 100) if total else 0,
-                'Off': (data.get(f'off_{kind}', 0) / total * 100) if total else 0,
-                'Behind': (data.get(f'bk_{kind}', 0) / total * 100) if total else 0
-            }
+                all_zones[rc] = {
+                    'Straight': (data.get(f'st_{kind}', 0) / total * 100) if total else 0,
+                    'Leg': (data.get(f'leg_{kind}', 0) / total * 100) if total else 0,
+                    'Off': (data.get(f'off_{kind}', 0) / total * 100) if total else 0,
+                    'Behind': (data.get(f'bk_{kind}', 0) / total * 100) if total else 0
+                }
 
         # CREATE FIGURE - Single horizontal stacked bar chart
         fig, ax = plt.subplots(figsize=(12, 5))
@@ -1504,16 +2591,200 @@ def create_zone_strength_table(dict_360, batter_name, selected_lengths, bowl_kin
 
 
 
+# Shot rollup index (fixed shot vocabulary × length × metric)
+_SHOT_METRICS = ('runs', 'avg_runs')
+
+
+def _shot_vocab(shot_pers):
+    found = set()
+    for shot_per in shot_pers:
+        for per in (shot_per or {}).values():
+            if isinstance(per, dict):
+                found.update(s for s, v in per.items() if isinstance(v, dict))
+    return sorted(found, key=str)
+
+
+def build_shot_index(shot_per, batter_name=None, shots=None, lengths=None, metrics=_SHOT_METRICS):
+    """
+    Pack a batter's shot_per into dense arrays.
+
+    values[l, s, m] is shot_per[length][shot][metric] (0 when missing) and
+    present[l, s] marks shots the length actually reports. Pass `shots` /
+    `lengths` to share one vocabulary across batters.
+
+    Returns {"batter", "lengths", "shots", "metrics", "values", "present"}.
+    """
+    shot_per = shot_per or {}
+    lengths = list(shot_per) if lengths is None else list(lengths)
+    shots = _shot_vocab([shot_per]) if shots is None else list(shots)
+    metrics = list(metrics)
+
+    col = {shot: j for j, shot in enumerate(shots)}
+    values = np.zeros((len(lengths), len(shots), len(metrics)))
+    present = np.zeros((len(lengths), len(shots)), dtype=bool)
+    for i, ln in enumerate(lengths):
+        per = shot_per.get(ln)
+        if not isinstance(per, dict):
+            continue
+        for shot, v in per.items():
+            j = col.get(shot)
+            if j is None or not isinstance(v, dict):
+                continue
+            present[i, j] = True
+            values[i, j] = [float(v.get(m, 0) or 0) for m in metrics]
+
+    return {
+        "batter": batter_name,
+        "lengths": lengths,
+        "shots": shots,
+        "metrics": metrics,
+        "values": values,
+        "present": present,
+    }
+
+
+def _shot_weights(lengths, selected_lengths, length_dict):
+    """Per-row ball weights over `lengths` and the full denominator (absent lengths still count)."""
+    row_of = {ln: i for i, ln in enumerate(lengths)}
+    weights = np.zeros(len(lengths))
+    rows = np.zeros(len(lengths), dtype=bool)
+    denom = 0.0
+    for ln in selected_lengths:
+        balls = float(length_dict.get(ln, 0) or 0)
+        i = row_of.get(ln)
+        if i is not None:
+            rows[i] = True
+        if balls == 0:
+            continue
+        denom += balls
+        if i is not None:
+            weights[i] += balls
+    return weights, rows, denom
+
+
+def shot_index_reduce(index, selected_lengths, length_dict):
+    """
+    Ball-weighted shot means for a length selection, every metric at once.
+
+    A shot missing from a length counts as 0 for that length. Only shots
+    reported by at least one selected length are flagged in `present`.
+
+    Returns (means, present): means is (shots × metrics), present is (shots,).
+    """
+    if isinstance(selected_lengths, (str, tuple)):
+        sel_lens = [selected_lengths] if isinstance(selected_lengths, str) else list(selected_lengths)
+    else:
+        sel_lens = list(selected_lengths)
+
+    weights, rows, denom = _shot_weights(index["lengths"], sel_lens, length_dict)
+    present = index["present"][rows].any(axis=0)
+    if denom <= 0:
+        return np.zeros(index["values"].shape[1:]), present
+    return np.tensordot(weights, index["values"], axes=1) / denom, present
+
+
+def build_league_shot_index(shot_pers, metrics=_SHOT_METRICS):
+    """
+    Stack every batter's shot index on one shared vocabulary.
+
+    shot_pers maps batter → shot_per. Returns the build_shot_index keys with
+    "batters" instead of "batter" and a leading batter axis on values /
+    present.
+    """
+    batters = list(shot_pers)
+    lengths = []
+    for shot_per in shot_pers.values():
+        for ln in (shot_per or {}):
+            if ln not in lengths:
+                lengths.append(ln)
+    shots = _shot_vocab(shot_pers.values())
+
+    per_batter = [build_shot_index(shot_pers[b], b, shots=shots, lengths=lengths, metrics=metrics)
+                  for b in batters]
+    n = (len(batters), len(lengths), len(shots))
+    return {
+        "batters": batters,
+        "row_of": {b: i for i, b in enumerate(batters)},
+        "lengths": lengths,
+        "shots": shots,
+        "metrics": list(metrics),
+        "values": np.stack([ix["values"] for ix in per_batter]) if per_batter else np.zeros(n + (len(metrics),)),
+        "present": np.stack([ix["present"] for ix in per_batter]) if per_batter else np.zeros(n, dtype=bool),
+    }
+
+
+def league_shot_comparison(
+    league_index,
+    batter,
+    selected_lengths,
+    length_dict,
+    value_type="runs",
+    league_length_dicts=None,
+):
+    """
+    A batter's shot values against the league median for a length selection.
+
+    Every batter is reduced in one einsum; each uses its own ball counts from
+    league_length_dicts when given, else `length_dict`. The median is over
+    batters that play the shot in the selected lengths.
+
+    Returns a DataFrame (shot, batter, league_median, delta, n_batters)
+    sorted by the batter's value, or None if the batter is not indexed.
+    """
+    if batter not in league_index["row_of"] or value_type not in league_index["metrics"]:
+        return None
+    if isinstance(selected_lengths, (str, tuple)):
+        sel_lens = [selected_lengths] if isinstance(selected_lengths, str) else list(selected_lengths)
+    else:
+        sel_lens = list(selected_lengths)
+
+    lengths = league_index["lengths"]
+    m = league_index["metrics"].index(value_type)
+    n_bat = len(league_index["batters"])
+    weights = np.zeros((n_bat, len(lengths)))
+    denom = np.zeros(n_bat)
+    rows = np.zeros(len(lengths), dtype=bool)
+    for b, name in enumerate(league_index["batters"]):
+        ld = (league_length_dicts or {}).get(name, length_dict)
+        weights[b], rows, denom[b] = _shot_weights(lengths, sel_lens, ld)
+
+    num = np.einsum('bl,bls->bs', weights, league_index["values"][..., m])
+    safe = np.where(denom > 0, denom, 1.0)[:, None]
+    means = np.where(denom[:, None] > 0, num / safe, 0.0)
+    present = league_index["present"][:, rows, :].any(axis=1)
+
+    plays = present.any(axis=0)
+    masked = np.where(present, means, np.nan)
+    counts = present.sum(axis=0)
+    median = np.full(len(league_index["shots"]), np.nan)
+    median[plays] = np.nanmedian(masked[:, plays], axis=0)
+
+    b = league_index["row_of"][batter]
+    keep = present[b]
+    out = pd.DataFrame({
+        "shot": np.asarray(league_index["shots"], dtype=object)[keep],
+        "batter": means[b, keep],
+        "league_median": median[keep],
+        "n_batters": counts[keep],
+    })
+    out["delta"] = out["batter"] - out["league_median"]
+    out = out[["shot", "batter", "league_median", "delta", "n_batters"]]
+    return out.sort_values("batter", ascending=False, kind="stable").reset_index(drop=True)
+
+
 def create_shot_profile_chart(
     shot_per,
     batter_name,
     selected_lengths,
     bowl_kind,
     length_dict,
-    value_type="runs"   # "runs" or "avg_runs"
+    value_type="runs",   # "runs" or "avg_runs"
+    shot_index=None,
 ):
     """
-    Modern horizontal bar chart with transparent background and glow effects
+    Modern horizontal bar chart with transparent background and glow effects.
+    Pass a build_shot_index result as `shot_index` to skip re-aggregating
+    shot_per.
     """
     try:
         # Normalize selected lengths
@@ -1523,33 +2794,15 @@ def create_shot_profile_chart(
             sel_lens = list(selected_lengths)
 
         # Aggregate shots across lengths (average, missing treated as 0)
-        shots_set = set()
-        per_len_shots = {}
-        for ln in sel_lens:
-            per = shot_per.get(ln, {})
-            per_len_shots[ln] = per
-            shots_set.update([s for s, v in (per or {}).items() if isinstance(v, dict)])
-
-        shots = {}
-
-        for shot in shots_set:
-            num = 0.0
-            denom = 0.0
-
-            for ln in sel_lens:
-                balls = length_dict.get(ln, 0)
-
-                if balls == 0:
-                    continue
-
-                per = per_len_shots.get(ln) or {}
-                val = per.get(shot, {}).get(value_type, 0)
-
-                num += val * balls
-                denom += balls
-
-            shots[shot] = num / denom if denom > 0 else 0.0
-
+        if shot_index is not None and value_type in shot_index["metrics"]:
+            means, present = shot_index_reduce(shot_index, sel_lens, length_dict)
+            m = shot_index["metrics"].index(value_type)
+            shots = {
+                shot: float(means[j, m])
+                for j, shot in enumerate(shot_index["shots"]) if present[j]
+            }
+        else:
+            shots = length_weighted_mean(shot_per, sel_lens, length_dict, field=value_type)
 
         if not shots:
             return None
@@ -1740,6 +2993,120 @@ def get_top_similar_batters(
 
     return out
 
+
+def build_similarity_index(sim_matrices):
+    """
+    Stack every (length, bowl_kind) similarity matrix into one dense float32
+    tensor sharing a single batter → row map.
+
+    sim_matrices: {(length, bowl_kind): DataFrame (batter × batter)}
+    Returns a dict consumed by query_top_similar_batters. Cells a matrix does
+    not cover (or NaN cells) are stored as 0, like a missing column in
+    get_top_similar_batters.
+    """
+    keys = list(sim_matrices.keys())
+    names = {}
+    for key in keys:
+        sim_df = sim_matrices[key]
+        for bat in sim_df.index:
+            names.setdefault(bat, len(names))
+        for bat in sim_df.columns:
+            names.setdefault(bat, len(names))
+
+    n_keys, n_bats = len(keys), len(names)
+    tensor = np.zeros((n_keys, n_bats, n_bats), dtype=np.float32)
+    row_present = np.zeros((n_keys, n_bats), dtype=bool)
+    col_present = np.zeros((n_keys, n_bats), dtype=bool)
+
+    for k, key in enumerate(keys):
+        sim_df = sim_matrices[key]
+        rows = np.array([names[b] for b in sim_df.index], dtype=np.intp)
+        cols = np.array([names[b] for b in sim_df.columns], dtype=np.intp)
+        vals = np.nan_to_num(sim_df.to_numpy(dtype=np.float32), nan=0.0)
+        tensor[k][np.ix_(rows, cols)] = vals
+        row_present[k, rows] = True
+        col_present[k, cols] = True
+
+    return {
+        "keys": {key: k for k, key in enumerate(keys)},
+        "batters": np.array(list(names), dtype=object),
+        "row_of": names,
+        "tensor": tensor,
+        "row_present": row_present,
+        "col_present": col_present,
+    }
+
+
+def query_top_similar_batters(sim_index, batter_names, length_sets, bowl_kind, top_n=5):
+    """
+    Batched get_top_similar_batters over a build_similarity_index result.
+
+    Answers every batter × length-set pair in one vectorized pass and picks
+    the top-N with argpartition instead of a full sort.
+
+    Returns {(batter, tuple(lengths)): DataFrame[batter, similarity] or None}.
+    """
+    if isinstance(batter_names, str):
+        batter_names = [batter_names]
+    if isinstance(length_sets, (str, tuple)):
+        length_sets = [length_sets]
+
+    sel_sets = []
+    for lens in length_sets:
+        if isinstance(lens, (str, tuple)):
+            sel_sets.append([lens] if isinstance(lens, str) else list(lens))
+        else:
+            sel_sets.append(list(lens))
+
+    row_of = sim_index["row_of"]
+    key_of = sim_index["keys"]
+    tensor = sim_index["tensor"]
+    bat_names = sim_index["batters"]
+    n_keys, n_bats = tensor.shape[0], tensor.shape[1]
+
+    out = {(b, tuple(lens)): None for b in batter_names for lens in sel_sets}
+    known = [b for b in dict.fromkeys(batter_names) if b in row_of]
+    if not known or not sel_sets or n_bats < 2 or top_n <= 0:
+        return out
+
+    # (sets × keys) multiplicity: a length listed twice is averaged twice, as before
+    sel = np.zeros((len(sel_sets), n_keys), dtype=np.float32)
+    for s, lens in enumerate(sel_sets):
+        for ln in lens:
+            k = key_of.get((ln, bowl_kind))
+            if k is not None:
+                sel[s, k] += 1.0
+
+    idx = np.array([row_of[b] for b in known], dtype=np.intp)
+    valid = sel[:, :, None] * sim_index["row_present"][:, idx][None, :, :]          # (S, K, B)
+    count = valid.sum(axis=1)                                                       # (S, B)
+    sums = np.einsum("skb,kbn->sbn", valid, tensor[:, idx, :])                      # (S, B, N)
+    seen = np.einsum("skb,kn->sbn", valid, sim_index["col_present"].astype(np.float32)) > 0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg = sums / count[:, :, None]
+    avg[~seen] = -np.inf
+    avg[:, np.arange(len(idx)), idx] = -np.inf
+
+    k_top = min(top_n, n_bats)
+    part = np.argpartition(-avg, k_top - 1, axis=-1)[..., :k_top]
+    part_vals = np.take_along_axis(avg, part, axis=-1)
+    order = np.argsort(-part_vals, axis=-1, kind="stable")
+    top_idx = np.take_along_axis(part, order, axis=-1)
+    top_vals = np.take_along_axis(part_vals, order, axis=-1)
+
+    for s, lens in enumerate(sel_sets):
+        for b, bat in enumerate(known):
+            if count[s, b] == 0:
+                continue
+            keep = np.isfinite(top_vals[s, b])
+            out[(bat, tuple(lens))] = pd.DataFrame({
+                "batter": bat_names[top_idx[s, b][keep]],
+                "similarity": top_vals[s, b][keep].astype(float),
+            })
+
+    return out
+
 def create_similarity_chart(
     sim_df,
    
@@ -1830,41 +3197,135 @@ _FEATURE_GROUPS = {
     "Strike":            lambda c: c.startswith("scores_line_"),
 }
 
-def _sim_row(df: pd.DataFrame, batter: str):
+def _sim_rows(df: pd.DataFrame, batters):
+    """
+    Similarity of each query batter against every row of df: (N, K) DataFrame.
+
+    Only the K query rows are scored (O(N·K·d)) instead of the full N × N
+    cosine and magnitude matrices.
+    """
+    batters = [b for b in dict.fromkeys(batters) if b in df.index]
     X = df.to_numpy(dtype=float)
-    if X.shape[1] == 0 or X.shape[0] < 2 or batter not in df.index:
+    if X.shape[1] == 0 or X.shape[0] < 2 or not batters:
         return None
     Xs = StandardScaler().fit_transform(X)
-    shape_sim = cosine_similarity(normalize(Xs, axis=1))
+    Xn = normalize(Xs, axis=1)
     mags = np.linalg.norm(Xs, axis=1)
-    mag_sim = np.exp(-np.abs(mags[:, None] - mags[None, :]))
-    pos = df.index.get_loc(batter)
-    return pd.Series((shape_sim * mag_sim)[pos], index=df.index)
+    pos = np.array([df.index.get_loc(b) for b in batters])
+    shape_sim = Xn[pos] @ Xn.T
+    mag_sim = np.exp(-np.abs(mags[pos][:, None] - mags[None, :]))
+    return pd.DataFrame((shape_sim * mag_sim).T, index=df.index, columns=batters)
+
+def _sim_row(df: pd.DataFrame, batter: str):
+    if batter not in df.index:
+        return None
+    rows = _sim_rows(df, [batter])
+    if rows is None:
+        return None
+    return rows[batter].rename(None)
+
+def _feat_data_hash(feat_data) -> str:
+    """
+    Content hash of feat_data for in-process cache checks.
+
+    Hashes the pickled payload (an order of magnitude cheaper than sorted
+    JSON); the same content inserted in a different order only costs a
+    rebuild. Falls back to JSON for values pickle cannot handle.
+    """
+    try:
+        payload = pickle.dumps(feat_data, protocol=4)
+    except Exception:
+        payload = json.dumps(feat_data, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
+def build_feature_store(feat_data):
+    """
+    Standardize every (_FEATURE_GROUPS group, length) slice of feat_data once.
+
+    Each entry keeps the row-normalized standardized matrix and its row norms,
+    so a breakdown for any batter is a matrix-vector pass per length.
+    """
+    batters = {}
+    groups = {name: [] for name in _FEATURE_GROUPS}
+    for ln, ln_data in feat_data.items():
+        if not ln_data:
+            continue
+        df = pd.DataFrame.from_dict(ln_data, orient='index')
+        if len(df) < 2:
+            continue
+        rows = np.array([batters.setdefault(b, len(batters)) for b in df.index], dtype=np.intp)
+        pos_of = {b: i for i, b in enumerate(df.index)}
+        for group_name, col_filter in _FEATURE_GROUPS.items():
+            cols = [c for c in df.columns if col_filter(c)]
+            if not cols:
+                continue
+            Xs = StandardScaler().fit_transform(df[cols].to_numpy(dtype=float))
+            groups[group_name].append({
+                "length": ln,
+                "rows": rows,
+                "pos_of": pos_of,
+                "Xn": normalize(Xs, axis=1),
+                "mags": np.linalg.norm(Xs, axis=1),
+            })
+
+    return {
+        "hash": _feat_data_hash(feat_data),
+        "batters": np.array(list(batters), dtype=object),
+        "groups": groups,
+    }
+
+
+_FEATURE_STORE_CACHE = {}
 
-def compute_feature_group_breakdown(feat_data, batter, top_n=5):
+
+def get_feature_store(feat_data):
+    """
+    Return the feature store for this feat_data snapshot, rebuilding it when
+    the content hash changes (in-place edits included). Callers on a hot
+    path should build the store once and pass store= instead.
+    """
+    key = _feat_data_hash(feat_data)
+    store = _FEATURE_STORE_CACHE.get("store")
+    if store is None or store["hash"] != key:
+        store = build_feature_store(feat_data)
+        _FEATURE_STORE_CACHE["store"] = store
+    return store
+
+
+def compute_feature_group_breakdown(feat_data, batter, top_n=5, store=None):
     """
     feat_data: {length: {batter_name: {feature: value}}}  (all batters, from /feat-data)
+    store:     build_feature_store(feat_data) result. Build it once per data load and
+               pass it here: that is the hot path (one matrix-vector pass per length).
+               If omitted, get_feature_store(feat_data) content-hashes the payload on
+               every call to detect changes.
     Returns:   {group_name: [{"batter": str, "similarity": float}, ...]}
     """
+    if store is None:
+        store = get_feature_store(feat_data)
+    names = store["batters"]
+
     breakdown = {}
-    for group_name, col_filter in _FEATURE_GROUPS.items():
-        parts = []
-        for ln_data in feat_data.values():
-            if not ln_data or batter not in ln_data:
-                continue
-            df = pd.DataFrame.from_dict(ln_data, orient='index')
-            cols = [c for c in df.columns if col_filter(c)]
-            if not cols:
+    for group_name, entries in store["groups"].items():
+        sums = np.zeros(len(names))
+        counts = np.zeros(len(names))
+        for entry in entries:
+            pos = entry["pos_of"].get(batter)
+            if pos is None:
                 continue
-            s = _sim_row(df[cols], batter)
-            if s is not None:
-                parts.append(s)
+            Xn, mags = entry["Xn"], entry["mags"]
+            sim = (Xn @ Xn[pos]) * np.exp(-np.abs(mags - mags[pos]))
+            np.add.at(sums, entry["rows"], sim)
+            np.add.at(counts, entry["rows"], 1.0)
 
-        if not parts:
+        seen = counts > 0
+        if not seen.any():
             breakdown[group_name] = []
             continue
 
-        mean_sim = pd.concat(parts, axis=1).mean(axis=1).drop(batter, errors='ignore')
+        mean_sim = pd.Series(sums[seen] / counts[seen], index=names[seen])
+        mean_sim = mean_sim.drop(batter, errors='ignore')
         top = mean_sim.sort_values(ascending=False).head(top_n)
         breakdown[group_name] = [{"batter": b, "similarity": float(v)} for b, v in top.items()]
 
@@ -2083,178 +3544,228 @@ def create_weakness_tiles(weakness_data: dict, batter_name: str, bowl_kind: str
     return fig
 
 
-def plot_intrel_pitch(
-    metric,
-    heading,
-    intrel_results,
-    batter,
-    lengths,
-    bowl_kind,
-    min_balls=10
-):
-    """
-    3D-perspective pitch showing intent-relative by length.
-    Returns matplotlib figure.
-    """
-    if bowl_kind=='pace bowler':
-        bowl_kind = 'pace'
-    else:
-        bowl_kind = 'spin'    
-    data = intrel_results or {}
-    if not data:
-        raise ValueError(f"No data for {batter} ({bowl_kind})")
+# Intrel pitch engine (perspective length view shared by the three pitch charts)
+_PITCH_FIGSIZE = (4.5, 6)
+_PITCH_SCALE = 1.35
+_PITCH_GEOM_SCALE = 1.08
+_PITCH_TOP_Y = 0.90
+_PITCH_BOT_Y = 0.05
+_PITCH_LEFT_BASE = 0.20
+_PITCH_RIGHT_BASE = 0.80
+_PITCH_PERSP = 0.15
+_PITCH_LENGTH_ZONES = {
+    "FULL": (0.75, 0.90),
+    "GOOD_LENGTH": (0.50, 0.75),
+    "SHORT_OF_A_GOOD_LENGTH": (0.30, 0.50),
+    "SHORT": (0.05, 0.30)
+}
+_PITCH_NEUTRAL_COLORS = ["#2563eb", "#16a34a"]  # blue, green
 
-    length_data = data.get(metric, {})
-    if not isinstance(length_data, dict) or not length_data:
-        raise ValueError(f"No metric data for {metric}")
+# Pickled base figures for the pitch views: {key: bytes} LRU, unpickled per render.
+# Keys are built only from finite parts (view name, bool handedness and one of
+# _LINE_VIEW_KINDS), so the bound is a safety net rather than a working-set limit.
+_PITCH_TEMPLATES = OrderedDict()
+_PITCH_TEMPLATE_MAX = 32
+_PITCH_TEMPLATE_LOCK = threading.Lock()
 
-    def _safe_float(x):
-        try:
-            if x is None:
-                return np.nan
-            v = float(x)
-            return v if np.isfinite(v) else np.nan
-        except Exception:
-            return np.nan
 
-    def _unpack_pair(v):
-        if isinstance(v, (list, tuple)) and len(v) >= 2:
-            return _safe_float(v[0]), int(v[1] or 0)
-        if isinstance(v, (int, float, np.floating)):
-            return _safe_float(v), 0
-        return np.nan, 0
-
-    scale = 1.35
-    geom_scale = 1.08
-    # --- figure ---
-    fig, ax = plt.subplots(figsize=(4.5, 6))
-    fig.patch.set_alpha(0)     # <-- IMPORTANT
-    ax.set_facecolor("none")  
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis("off")
-    fig.subplots_adjust(left=0, right=1, bottom=0, top=1)
+def _figure_template(key, build):
+    """
+    Fresh copy of a cached base figure.
 
-    # --- perspective transform (simple trapezoid pitch) ---
-    top_y = 0.90
-    bot_y = 0.05
-    left_base = 0.20
-    right_base = 0.80
-    persp = 0.15
+    build() draws the static artists once; the figure is pickled under `key`
+    and every call unpickles an independent (pyplot-registered) copy. At most
+    _PITCH_TEMPLATE_MAX templates are kept, least recently used first out.
+    Returns (fig, ax).
+    """
+    with _PITCH_TEMPLATE_LOCK:
+        blob = _PITCH_TEMPLATES.get(key)
+        if blob is None:
+            fig = build()
+            blob = pickle.dumps(fig)
+            plt.close(fig)
+            _PITCH_TEMPLATES[key] = blob
+            while len(_PITCH_TEMPLATES) > _PITCH_TEMPLATE_MAX:
+                _PITCH_TEMPLATES.popitem(last=False)
+        else:
+            _PITCH_TEMPLATES.move_to_end(key)
+    fig = pickle.loads(blob)
+    return fig, fig.axes[0]
 
-    def sx(x):
-        return 0.5 + (x - 0.5) * geom_scale
 
-    def sy(y):
-        return 0.5 + (y - 0.5) * geom_scale
+def _safe_float(x):
+    try:
+        if x is None:
+            return np.nan
+        v = float(x)
+        return v if np.isfinite(v) else np.nan
+    except Exception:
+        return np.nan
+
+
+def _unpack_pair(v):
+    """(value, balls) from a backend [value, balls] pair; bare numbers have 0 balls."""
+    if isinstance(v, (list, tuple)) and len(v) >= 2:
+        return _safe_float(v[0]), int(v[1] or 0)
+    if isinstance(v, (int, float, np.floating)):
+        return _safe_float(v), 0
+    return np.nan, 0
+
 
-    pitch = np.array([
-        [sx(left_base + top_y * persp), sy(top_y)],
-        [sx(right_base - top_y * persp), sy(top_y)],
-        [sx(right_base - bot_y * persp), sy(bot_y)],
-        [sx(left_base + bot_y * persp), sy(bot_y)],
+def _pitch_sx(x):
+    return 0.5 + (x - 0.5) * _PITCH_GEOM_SCALE
+
+
+def _pitch_sy(y):
+    return 0.5 + (y - 0.5) * _PITCH_GEOM_SCALE
+
+
+def _pitch_trapezoid(y0, y1):
+    """Perspective band between pitch depths y0 (near) and y1 (far)."""
+    return np.array([
+        [_pitch_sx(_PITCH_LEFT_BASE + y0 * _PITCH_PERSP), _pitch_sy(y0)],
+        [_pitch_sx(_PITCH_RIGHT_BASE - y0 * _PITCH_PERSP), _pitch_sy(y0)],
+        [_pitch_sx(_PITCH_RIGHT_BASE - y1 * _PITCH_PERSP), _pitch_sy(y1)],
+        [_pitch_sx(_PITCH_LEFT_BASE + y1 * _PITCH_PERSP), _pitch_sy(y1)],
     ])
 
+
+def _build_intrel_pitch_base():
+    fig, ax = plt.subplots(figsize=_PITCH_FIGSIZE)
+    fig.patch.set_alpha(0)     # <-- IMPORTANT
+    ax.set_facecolor("none")
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.axis("off")
+    fig.subplots_adjust(left=0, right=1, bottom=0, top=1)
+
     ax.add_patch(
         patches.Polygon(
-            pitch,
+            _pitch_trapezoid(_PITCH_TOP_Y, _PITCH_BOT_Y),
             closed=True,
             fill=False,
             edgecolor="white",
-            linewidth=3.2 * scale,
+            linewidth=3.2 * _PITCH_SCALE,
             alpha=0.95,
             joinstyle="round"
         )
     )
+    for x in [_pitch_sx(0.48), _pitch_sx(0.50), _pitch_sx(0.52)]:
+        ax.plot([x, x], [_pitch_sy(0.90), _pitch_sy(0.975)],
+                color="white", linewidth=3 * _PITCH_SCALE)
+    return fig
 
 
-    # --- normalize int-rel for colors ---
-    intrels = []
-    for v in length_data.values():
-        iv, balls = _unpack_pair(v)
-        if not np.isnan(iv) and balls >= min_balls:
-            intrels.append(iv)
-
-    if not intrels:
-        raise ValueError("No lengths with sufficient balls")
-
-    colors_list = [
-    '#fde047', '#fbbf24', '#f97316',
-    '#dc2626', '#991b1b', '#450a0a'
-    ]
-    modern_cmap = LinearSegmentedColormap.from_list(
-        'modern_red', colors_list, N=256
-    )
-
-    norm = Normalize(vmin=0.5, vmax=1.5)
-    mapper = ScalarMappable(norm=norm, cmap=modern_cmap)
-    LENGTH_ZONES = {
-    "FULL": (0.75, 0.90),
-    "GOOD_LENGTH": (0.50, 0.75),
-    "SHORT_OF_A_GOOD_LENGTH": (0.30, 0.50),
-    "SHORT": (0.05, 0.30)
-    }
-    
-    # --- draw length bands ---
-    for length, (y0, y1) in LENGTH_ZONES.items():
-        if length not in lengths:
-         continue 
-        intrel, balls = _unpack_pair(length_data.get(length, (np.nan, 0)))
-        if balls < min_balls or np.isnan(intrel):
-            continue
-
-        color = mapper.to_rgba(intrel)
+def _render_intrel_pitch(bands, heading):
+    """
+    Draw length bands on a copy of the pitch template (outline + stumps).
 
-        # trapezoidal band (perspective scaling)
-        band = np.array([
-            [sx(left_base + y0 * persp), sy(y0)],
-            [sx(right_base - y0 * persp), sy(y0)],
-            [sx(right_base - y1 * persp), sy(y1)],
-            [sx(left_base + y1 * persp), sy(y1)],
-        ])
+    bands: [(length, facecolor, label)] in draw order; lengths must be
+    _PITCH_LENGTH_ZONES keys.
+    """
+    fig, ax = _figure_template(("intrel", "length"), _build_intrel_pitch_base)
 
+    for length, color, label in bands:
+        y0, y1 = _PITCH_LENGTH_ZONES[length]
         ax.add_patch(
             patches.Polygon(
-                band,
+                _pitch_trapezoid(y0, y1),
                 closed=True,
                 facecolor=color,
                 edgecolor="white",
-                linewidth=2 * scale,
+                linewidth=2 * _PITCH_SCALE,
                 alpha=0.65
             )
         )
-
-        # label
         ax.text(
-            sx(0.5),
-            sy((y0 + y1) / 2),
-            f"{length.replace('_', ' ')}\n{intrel:.2f}",
+            _pitch_sx(0.5),
+            _pitch_sy((y0 + y1) / 2),
+            f"{length.replace('_', ' ')}\n{label}",
             color="white",
-            fontsize=8 * scale,
+            fontsize=8 * _PITCH_SCALE,
             ha="center",
             va="center",
             fontweight="bold"
         )
 
-    
-    stump_x = [sx(0.48), sx(0.50), sx(0.52)]
-    for x in stump_x:
-        ax.plot([x, x], [sy(0.90), sy(0.975)], color="white", linewidth=3 * scale)
-    
-    # --- title ---
     ax.text(
         0.5, 1.08, heading,
         transform=ax.transAxes,
         ha="center",
         va="top",
-        fontsize=12 * scale,
+        fontsize=12 * _PITCH_SCALE,
         fontweight="bold",
         color="white",
         clip_on=False
     )
-
     return fig
 
+
+def _neutral_bands(rows):
+    """Alternate the neutral band colours over [(length, label)]."""
+    return [
+        (length, _PITCH_NEUTRAL_COLORS[i % 2], label)
+        for i, (length, label) in enumerate(rows)
+    ]
+
+
+def plot_intrel_pitch(
+    metric,
+    heading,
+    intrel_results,
+    batter,
+    lengths,
+    bowl_kind,
+    min_balls=10
+):
+    """
+    3D-perspective pitch showing intent-relative by length.
+    Returns matplotlib figure.
+    """
+    if bowl_kind=='pace bowler':
+        bowl_kind = 'pace'
+    else:
+        bowl_kind = 'spin'    
+    data = intrel_results or {}
+    if not data:
+        raise ValueError(f"No data for {batter} ({bowl_kind})")
+
+    length_data = data.get(metric, {})
+    if not isinstance(length_data, dict) or not length_data:
+        raise ValueError(f"No metric data for {metric}")
+
+    # --- normalize int-rel for colors ---
+    intrels = []
+    for v in length_data.values():
+        iv, balls = _unpack_pair(v)
+        if not np.isnan(iv) and balls >= min_balls:
+            intrels.append(iv)
+
+    if not intrels:
+        raise ValueError("No lengths with sufficient balls")
+
+    colors_list = [
+    '#fde047', '#fbbf24', '#f97316',
+    '#dc2626', '#991b1b', '#450a0a'
+    ]
+    modern_cmap = LinearSegmentedColormap.from_list(
+        'modern_red', colors_list, N=256
+    )
+
+    norm = Normalize(vmin=0.5, vmax=1.5)
+    mapper = ScalarMappable(norm=norm, cmap=modern_cmap)
+
+    bands = []
+    for length in _PITCH_LENGTH_ZONES:
+        if length not in lengths:
+            continue
+        intrel, balls = _unpack_pair(length_data.get(length, (np.nan, 0)))
+        if balls < min_balls or np.isnan(intrel):
+            continue
+        bands.append((length, mapper.to_rgba(intrel), f"{intrel:.2f}"))
+
+    return _render_intrel_pitch(bands, heading)
+
 def plot_intrel_pitch_avg(
     intrel_results,
     batter,
@@ -2282,78 +3793,8 @@ def plot_intrel_pitch_avg(
     if not isinstance(sr_data, dict) or not isinstance(con_data, dict):
         raise ValueError("Invalid avg metric payload")
 
-    def _safe_float(x):
-        try:
-            if x is None:
-                return np.nan
-            v = float(x)
-            return v if np.isfinite(v) else np.nan
-        except Exception:
-            return np.nan
-
-    def _unpack_pair(v):
-        if isinstance(v, (list, tuple)) and len(v) >= 2:
-            return _safe_float(v[0]), int(v[1] or 0)
-        if isinstance(v, (int, float, np.floating)):
-            return _safe_float(v), 0
-        return np.nan, 0
-
-    scale = 1.35
-    geom_scale = 1.08
-    # --- figure ---
-    fig, ax = plt.subplots(figsize=(4.5, 6))
-    fig.patch.set_alpha(0)
-    ax.set_facecolor("none")
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis("off")
-    fig.subplots_adjust(left=0, right=1, bottom=0, top=1)
-
-    # --- perspective pitch ---
-    top_y = 0.90
-    bot_y = 0.05
-    left_base = 0.20
-    right_base = 0.80
-    persp = 0.15
-
-    def sx(x):
-        return 0.5 + (x - 0.5) * geom_scale
-
-    def sy(y):
-        return 0.5 + (y - 0.5) * geom_scale
-
-    pitch = np.array([
-        [sx(left_base + top_y * persp), sy(top_y)],
-        [sx(right_base - top_y * persp), sy(top_y)],
-        [sx(right_base - bot_y * persp), sy(bot_y)],
-        [sx(left_base + bot_y * persp), sy(bot_y)],
-    ])
-
-    ax.add_patch(
-        patches.Polygon(
-            pitch,
-            closed=True,
-            fill=False,
-            edgecolor="white",
-            linewidth=3.2 * scale,
-            alpha=0.95,
-            joinstyle="round"
-        )
-    )
-
-    LENGTH_ZONES = {
-        "FULL": (0.75, 0.90),
-        "GOOD_LENGTH": (0.50, 0.75),
-        "SHORT_OF_A_GOOD_LENGTH": (0.30, 0.50),
-        "SHORT": (0.05, 0.30)
-    }
-
-    # alternating neutral colors
-    colors = ["#2563eb", "#16a34a"]  # blue, green
-
-    # --- draw bands ---
-    color_idx = 0
-    for length, (y0, y1) in LENGTH_ZONES.items():
+    rows = []
+    for length in _PITCH_LENGTH_ZONES:
         if length not in lengths:
             continue
 
@@ -2363,57 +3804,9 @@ def plot_intrel_pitch_avg(
         balls = min(balls_sr, balls_con)
         if balls < min_balls or np.isnan(sr) or np.isnan(con):
             continue
+        rows.append((length, f"{sr:.0f}, {con:.0f}%"))
 
-        color = colors[color_idx % 2]
-        color_idx += 1
-
-        band = np.array([
-            [sx(left_base + y0 * persp), sy(y0)],
-            [sx(right_base - y0 * persp), sy(y0)],
-            [sx(right_base - y1 * persp), sy(y1)],
-            [sx(left_base + y1 * persp), sy(y1)],
-        ])
-
-        ax.add_patch(
-            patches.Polygon(
-                band,
-                closed=True,
-                facecolor=color,
-                edgecolor="white",
-                linewidth=2 * scale,
-                alpha=0.65
-            )
-        )
-
-        ax.text(
-            sx(0.5),
-            sy((y0 + y1) / 2),
-            f"{length.replace('_', ' ')}\n{sr:.0f}, {con:.0f}%",
-            color="white",
-            fontsize=8 * scale,
-            ha="center",
-            va="center",
-            fontweight="bold"
-        )
-
-    # --- stumps ---
-    for x in [sx(0.48), sx(0.50), sx(0.52)]:
-        ax.plot([x, x], [sy(0.90), sy(0.975)], color="white", linewidth=3 * scale)
-
-    # --- heading ---
-    ax.text(
-        0.5, 1.08,
-        "Avg Bat (SR, Control%)",
-        transform=ax.transAxes,
-        ha="center",
-        va="top",
-        fontsize=12 * scale,
-        fontweight="bold",
-        color="white",
-        clip_on=False
-    )
-
-    return fig
+    return _render_intrel_pitch(_neutral_bands(rows), "Avg Bat (SR, Control%)")
 
 
 def plot_intrel_pitch_batter(
@@ -2446,73 +3839,8 @@ def plot_intrel_pitch_batter(
     if not all(isinstance(d, dict) for d in [intent_data, rel_data, oth_sr_data, oth_con_data]):
         raise ValueError("Invalid batter metric payload")
 
-    def _safe_float(x):
-        try:
-            if x is None:
-                return np.nan
-            v = float(x)
-            return v if np.isfinite(v) else np.nan
-        except Exception:
-            return np.nan
-
-    def _unpack_pair(v):
-        if isinstance(v, (list, tuple)) and len(v) >= 2:
-            return _safe_float(v[0]), int(v[1] or 0)
-        if isinstance(v, (int, float, np.floating)):
-            return _safe_float(v), 0
-        return np.nan, 0
-
-    scale = 1.35
-    geom_scale = 1.08
-    fig, ax = plt.subplots(figsize=(4.5, 6))
-    fig.patch.set_alpha(0)
-    ax.set_facecolor("none")
-    ax.set_xlim(0, 1)
-    ax.set_ylim(0, 1)
-    ax.axis("off")
-    fig.subplots_adjust(left=0, right=1, bottom=0, top=1)
-
-    top_y = 0.90
-    bot_y = 0.05
-    left_base = 0.20
-    right_base = 0.80
-    persp = 0.15
-
-    def sx(x):
-        return 0.5 + (x - 0.5) * geom_scale
-
-    def sy(y):
-        return 0.5 + (y - 0.5) * geom_scale
-
-    pitch = np.array([
-        [sx(left_base + top_y * persp), sy(top_y)],
-        [sx(right_base - top_y * persp), sy(top_y)],
-        [sx(right_base - bot_y * persp), sy(bot_y)],
-        [sx(left_base + bot_y * persp), sy(bot_y)],
-    ])
-
-    ax.add_patch(
-        patches.Polygon(
-            pitch,
-            closed=True,
-            fill=False,
-            edgecolor="white",
-            linewidth=3.2 * scale,
-            alpha=0.95,
-            joinstyle="round"
-        )
-    )
-
-    LENGTH_ZONES = {
-        "FULL": (0.75, 0.90),
-        "GOOD_LENGTH": (0.50, 0.75),
-        "SHORT_OF_A_GOOD_LENGTH": (0.30, 0.50),
-        "SHORT": (0.05, 0.30)
-    }
-
-    colors = ["#2563eb", "#16a34a"]  # match Avg Bat (blue/green)
-    color_idx = 0
-    for length, (y0, y1) in LENGTH_ZONES.items():
+    rows = []
+    for length in _PITCH_LENGTH_ZONES:
         if length not in lengths:
             continue
 
@@ -2527,54 +3855,9 @@ def plot_intrel_pitch_batter(
 
         batter_sr = oth_sr * intent
         batter_con = oth_con * reliability
+        rows.append((length, f"{batter_sr:.0f}, {batter_con:.0f}%"))
 
-        color = colors[color_idx % 2]
-        color_idx += 1
-        band = np.array([
-            [sx(left_base + y0 * persp), sy(y0)],
-            [sx(right_base - y0 * persp), sy(y0)],
-            [sx(right_base - y1 * persp), sy(y1)],
-            [sx(left_base + y1 * persp), sy(y1)],
-        ])
-
-        ax.add_patch(
-            patches.Polygon(
-                band,
-                closed=True,
-                facecolor=color,
-                edgecolor="white",
-                linewidth=2 * scale,
-                alpha=0.65
-            )
-        )
-
-        ax.text(
-            sx(0.5),
-            sy((y0 + y1) / 2),
-            f"{length.replace('_', ' ')}\n{batter_sr:.0f}, {batter_con:.0f}%",
-            color="white",
-            fontsize=8 * scale,
-            ha="center",
-            va="center",
-            fontweight="bold"
-        )
-
-    for x in [sx(0.48), sx(0.50), sx(0.52)]:
-        ax.plot([x, x], [sy(0.90), sy(0.975)], color="white", linewidth=3 * scale)
-
-    ax.text(
-        0.5, 1.08,
-        "Batter (SR, Control%)",
-        transform=ax.transAxes,
-        ha="center",
-        va="top",
-        fontsize=12 * scale,
-        fontweight="bold",
-        color="white",
-        clip_on=False
-    )
-
-    return fig
+    return _render_intrel_pitch(_neutral_bands(rows), "Batter (SR, Control%)")
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -2632,18 +3915,97 @@ def _line_draw_stumps(ax, is_lhb=False):
             color=(1, 1, 1, 0.40), fontsize=7.5, style="italic")
 
 
-def _line_unpack(v):
-    def _sf(x):
-        try:
-            vv = float(x)
-            return vv if np.isfinite(vv) else np.nan
-        except Exception:
-            return np.nan
-    if isinstance(v, (list, tuple)) and len(v) >= 2:
-        return _sf(v[0]), int(v[1] or 0)
-    if isinstance(v, (int, float, np.floating)):
-        return _sf(v), 0
-    return np.nan, 0
+_LINE_NO_DATA_FC = (0.22, 0.22, 0.22, 0.45)
+_LINE_NEUTRAL_COLORS = ["#2563eb", "#16a34a"]
+
+
+def _line_draw_zone_labels(ax, is_lhb=False):
+    zones = _LINE_ZONES_LHB if is_lhb else _LINE_ZONES
+    sxs   = _STUMP_XS_LHB  if is_lhb else _STUMP_XS
+    stump_top = _ZONE_Y0 + (_ZONE_Y1 - _ZONE_Y0) * _STUMP_FRAC
+    label_y   = (_ZONE_Y0 + stump_top) / 2
+    for line, x0, x1, label in zones:
+        cx = (x0 + x1) / 2
+        if line == "ON_THE_STUMPS":
+            ax.text((sxs[0] + sxs[1]) / 2, label_y, "On",
+                    ha="center", va="center", color=(1, 1, 1, 1.0),
+                    fontsize=18, fontweight="bold", rotation=90, zorder=6)
+            ax.text((sxs[1] + sxs[2]) / 2, label_y, "Stumps",
+                    ha="center", va="center", color=(1, 1, 1, 1.0),
+                    fontsize=18, fontweight="bold", rotation=90, zorder=6)
+        else:
+            ax.text(cx, label_y, label,
+                    ha="center", va="center", color=(1, 1, 1, 1.0),
+                    fontsize=18, fontweight="bold", rotation=90, zorder=6)
+
+
+_LINE_VIEW_KINDS = ("metric", "batter", "avg")
+
+
+def _line_template(is_lhb, view_kind, heading):
+    """
+    (fig, ax) for a line view with every static artist already in place.
+
+    Axes, stumps and zone labels are drawn and laid out once per
+    (is_lhb, view_kind); the free-form heading is drawn on each copy.
+    The heading, zone rectangles and value texts all sit inside the axes
+    and so leave tight_layout's result unchanged.
+    """
+    if view_kind not in _LINE_VIEW_KINDS:
+        raise ValueError(f"Unknown line view: {view_kind}")
+
+    def build():
+        fig, ax = _line_base_fig()
+        _line_draw_zone_labels(ax, is_lhb=is_lhb)
+        _line_draw_stumps(ax, is_lhb=is_lhb)
+        plt.tight_layout()
+        return fig
+
+    fig, ax = _figure_template(("line", bool(is_lhb), view_kind), build)
+    ax.text(0.5, _ZONE_Y1 + 0.05, heading, ha="center", va="bottom", color="white",
+            fontsize=11.5, fontweight="bold", zorder=5, clip_on=False)
+    return fig, ax
+
+
+def _line_draw_zone(ax, x0, x1, fc, alpha):
+    ax.add_patch(patches.Rectangle(
+        (x0, _ZONE_Y0), x1 - x0, _ZONE_Y1 - _ZONE_Y0,
+        facecolor=fc, edgecolor=(1, 1, 1, 0.20), linewidth=0.8,
+        alpha=alpha, zorder=2
+    ))
+
+
+def _line_draw_sr_con(ax, cx, sr, con):
+    """SR / Control% pair above the stumps, or a dash when sr is None."""
+    stump_top = _ZONE_Y0 + (_ZONE_Y1 - _ZONE_Y0) * _STUMP_FRAC
+    gap       = _ZONE_Y1 - stump_top
+    sr_y      = stump_top + gap * 0.72
+    con_y     = stump_top + gap * 0.35
+    if sr is None:
+        ax.text(cx, sr_y, "—", ha="center", va="center",
+                color=(1, 1, 1, 0.25), fontsize=14, zorder=5)
+    else:
+        ax.text(cx, sr_y, f"SR {sr:.0f}",
+                ha="center", va="center", color="white",
+                fontsize=12, fontweight="bold", zorder=5)
+        ax.text(cx, con_y, f"Con {con:.0f}%",
+                ha="center", va="center", color=(1, 1, 1, 0.85),
+                fontsize=11, fontweight="bold", zorder=5)
+
+
+def _line_draw_neutral(ax, rows, is_lhb=False):
+    """Neutral alternating zones from {line: (sr, con) or None}."""
+    zones = _LINE_ZONES_LHB if is_lhb else _LINE_ZONES
+    color_idx = 0
+    for line, x0, x1, _ in zones:
+        pair = rows.get(line)
+        if pair is None:
+            _line_draw_zone(ax, x0, x1, _LINE_NO_DATA_FC, 1.0)
+            _line_draw_sr_con(ax, (x0 + x1) / 2, None, None)
+        else:
+            _line_draw_zone(ax, x0, x1, _LINE_NEUTRAL_COLORS[color_idx % 2], 0.68)
+            color_idx += 1
+            _line_draw_sr_con(ax, (x0 + x1) / 2, *pair)
 
 
 def plot_line_intrel_pitch(metric, heading, line_intrel_results, batter, bowl_kind, min_balls=10, is_lhb=False):
@@ -2665,37 +4027,18 @@ def plot_line_intrel_pitch(metric, heading, line_intrel_results, batter, bowl_ki
     norm = Normalize(vmin=0.5, vmax=1.5)
     mapper = ScalarMappable(norm=norm, cmap=cmap)
 
-    fig, ax = _line_base_fig()
+    fig, ax = _line_template(is_lhb, "metric", heading)
     zones = _LINE_ZONES_LHB if is_lhb else _LINE_ZONES
-    sxs   = _STUMP_XS_LHB  if is_lhb else _STUMP_XS
+    stump_top = _ZONE_Y0 + (_ZONE_Y1 - _ZONE_Y0) * _STUMP_FRAC
+    val_y     = (stump_top + _ZONE_Y1) / 2
 
     for line, x0, x1, label in zones:
-        val, balls = _line_unpack(line_data.get(line, (np.nan, 0)))
+        val, balls = _unpack_pair(line_data.get(line, (np.nan, 0)))
         no_data = balls < min_balls or np.isnan(val)
-        fc = (0.22, 0.22, 0.22, 0.45) if no_data else mapper.to_rgba(val)
-
-        ax.add_patch(patches.Rectangle(
-            (x0, _ZONE_Y0), x1 - x0, _ZONE_Y1 - _ZONE_Y0,
-            facecolor=fc, edgecolor=(1, 1, 1, 0.20), linewidth=0.8,
-            alpha=0.72 if not no_data else 1.0, zorder=2
-        ))
-
-        cx        = (x0 + x1) / 2
-        stump_top = _ZONE_Y0 + (_ZONE_Y1 - _ZONE_Y0) * _STUMP_FRAC
-        val_y     = (stump_top + _ZONE_Y1) / 2
-        label_y   = (_ZONE_Y0 + stump_top) / 2
-        if line == "ON_THE_STUMPS":
-            ax.text((sxs[0] + sxs[1]) / 2, label_y, "On",
-                    ha="center", va="center", color=(1, 1, 1, 1.0),
-                    fontsize=18, fontweight="bold", rotation=90, zorder=6)
-            ax.text((sxs[1] + sxs[2]) / 2, label_y, "Stumps",
-                    ha="center", va="center", color=(1, 1, 1, 1.0),
-                    fontsize=18, fontweight="bold", rotation=90, zorder=6)
-        else:
-            ax.text(cx, label_y, label,
-                    ha="center", va="center", color=(1, 1, 1, 1.0),
-                    fontsize=18, fontweight="bold", rotation=90, zorder=6)
+        fc = _LINE_NO_DATA_FC if no_data else mapper.to_rgba(val)
+        _line_draw_zone(ax, x0, x1, fc, 0.72 if not no_data else 1.0)
 
+        cx = (x0 + x1) / 2
         if no_data:
             ax.text(cx, val_y, "—", ha="center", va="center",
                     color=(1, 1, 1, 0.25), fontsize=16, zorder=5)
@@ -2704,11 +4047,6 @@ def plot_line_intrel_pitch(metric, heading, line_intrel_results, batter, bowl_ki
                     ha="center", va="center", color="white",
                     fontsize=16, fontweight="bold", zorder=5)
 
-    _line_draw_stumps(ax, is_lhb=is_lhb)
-
-    ax.text(0.5, _ZONE_Y1 + 0.05, heading, ha="center", va="bottom", color="white",
-            fontsize=11.5, fontweight="bold", zorder=5, clip_on=False)
-    plt.tight_layout()
     return fig
 
 
@@ -2730,70 +4068,20 @@ def plot_line_intrel_pitch_batter(line_intrel_results, batter, bowl_kind, min_ba
     if not all(isinstance(d, dict) for d in [intent_d, rel_d, oth_sr_d, oth_con_d]):
         raise ValueError("Invalid batter line payload")
 
-    colors = ["#2563eb", "#16a34a"]
-    fig, ax = _line_base_fig()
-    color_idx = 0
-    zones = _LINE_ZONES_LHB if is_lhb else _LINE_ZONES
-    sxs   = _STUMP_XS_LHB  if is_lhb else _STUMP_XS
-
-    for line, x0, x1, label in zones:
-        intent,  bi  = _line_unpack(intent_d.get(line,  (np.nan, 0)))
-        rel,     br  = _line_unpack(rel_d.get(line,     (np.nan, 0)))
-        oth_sr,  bsr = _line_unpack(oth_sr_d.get(line,  (np.nan, 0)))
-        oth_con, bc  = _line_unpack(oth_con_d.get(line, (np.nan, 0)))
+    rows = {}
+    for line, _, _, _ in _LINE_ZONES:
+        intent,  bi  = _unpack_pair(intent_d.get(line,  (np.nan, 0)))
+        rel,     br  = _unpack_pair(rel_d.get(line,     (np.nan, 0)))
+        oth_sr,  bsr = _unpack_pair(oth_sr_d.get(line,  (np.nan, 0)))
+        oth_con, bc  = _unpack_pair(oth_con_d.get(line, (np.nan, 0)))
 
         balls = min(bi, br, bsr, bc)
         no_data = (balls < min_balls or
                    any(np.isnan(v) for v in [intent, rel, oth_sr, oth_con]))
+        rows[line] = None if no_data else (oth_sr * intent, oth_con * rel)
 
-        if no_data:
-            fc = (0.22, 0.22, 0.22, 0.45)
-        else:
-            fc = colors[color_idx % 2]
-            color_idx += 1
-
-        ax.add_patch(patches.Rectangle(
-            (x0, _ZONE_Y0), x1 - x0, _ZONE_Y1 - _ZONE_Y0,
-            facecolor=fc, edgecolor=(1, 1, 1, 0.20), linewidth=0.8,
-            alpha=0.68 if not no_data else 1.0, zorder=2
-        ))
-
-        cx        = (x0 + x1) / 2
-        stump_top = _ZONE_Y0 + (_ZONE_Y1 - _ZONE_Y0) * _STUMP_FRAC
-        gap       = _ZONE_Y1 - stump_top
-        sr_y      = stump_top + gap * 0.72
-        con_y     = stump_top + gap * 0.35
-        label_y   = (_ZONE_Y0 + stump_top) / 2
-        if line == "ON_THE_STUMPS":
-            ax.text((sxs[0] + sxs[1]) / 2, label_y, "On",
-                    ha="center", va="center", color=(1, 1, 1, 1.0),
-                    fontsize=18, fontweight="bold", rotation=90, zorder=6)
-            ax.text((sxs[1] + sxs[2]) / 2, label_y, "Stumps",
-                    ha="center", va="center", color=(1, 1, 1, 1.0),
-                    fontsize=18, fontweight="bold", rotation=90, zorder=6)
-        else:
-            ax.text(cx, label_y, label,
-                    ha="center", va="center", color=(1, 1, 1, 1.0),
-                    fontsize=18, fontweight="bold", rotation=90, zorder=6)
-
-        if no_data:
-            ax.text(cx, sr_y, "—", ha="center", va="center",
-                    color=(1, 1, 1, 0.25), fontsize=14, zorder=5)
-        else:
-            bsr_val  = oth_sr  * intent
-            bcon_val = oth_con * rel
-            ax.text(cx, sr_y, f"SR {bsr_val:.0f}",
-                    ha="center", va="center", color="white",
-                    fontsize=12, fontweight="bold", zorder=5)
-            ax.text(cx, con_y, f"Con {bcon_val:.0f}%",
-                    ha="center", va="center", color=(1, 1, 1, 0.85),
-                    fontsize=11, fontweight="bold", zorder=5)
-
-    _line_draw_stumps(ax, is_lhb=is_lhb)
-
-    ax.text(0.5, _ZONE_Y1 + 0.05, "Batter (SR, Control%)", ha="center", va="bottom",
-            color="white", fontsize=11.5, fontweight="bold", zorder=5, clip_on=False)
-    plt.tight_layout()
+    fig, ax = _line_template(is_lhb, "batter", "Batter (SR, Control%)")
+    _line_draw_neutral(ax, rows, is_lhb=is_lhb)
     return fig
 
 
@@ -2812,65 +4100,17 @@ def plot_line_intrel_pitch_avg(line_intrel_results, batter, bowl_kind, min_balls
     if not all(isinstance(d, dict) for d in [sr_d, con_d]):
         raise ValueError("Invalid avg line payload")
 
-    colors = ["#2563eb", "#16a34a"]
-    fig, ax = _line_base_fig()
-    color_idx = 0
-    zones = _LINE_ZONES_LHB if is_lhb else _LINE_ZONES
-    sxs   = _STUMP_XS_LHB  if is_lhb else _STUMP_XS
-
-    for line, x0, x1, label in zones:
-        sr,  bsr = _line_unpack(sr_d.get(line,  (np.nan, 0)))
-        con, bc  = _line_unpack(con_d.get(line, (np.nan, 0)))
+    rows = {}
+    for line, _, _, _ in _LINE_ZONES:
+        sr,  bsr = _unpack_pair(sr_d.get(line,  (np.nan, 0)))
+        con, bc  = _unpack_pair(con_d.get(line, (np.nan, 0)))
 
         balls = min(bsr, bc)
         no_data = balls < min_balls or np.isnan(sr) or np.isnan(con)
+        rows[line] = None if no_data else (sr, con)
 
-        if no_data:
-            fc = (0.22, 0.22, 0.22, 0.45)
-        else:
-            fc = colors[color_idx % 2]
-            color_idx += 1
-
-        ax.add_patch(patches.Rectangle(
-            (x0, _ZONE_Y0), x1 - x0, _ZONE_Y1 - _ZONE_Y0,
-            facecolor=fc, edgecolor=(1, 1, 1, 0.20), linewidth=0.8,
-            alpha=0.68 if not no_data else 1.0, zorder=2
-        ))
-
-        cx        = (x0 + x1) / 2
-        stump_top = _ZONE_Y0 + (_ZONE_Y1 - _ZONE_Y0) * _STUMP_FRAC
-        gap       = _ZONE_Y1 - stump_top
-        sr_y      = stump_top + gap * 0.72
-        con_y     = stump_top + gap * 0.35
-        label_y   = (_ZONE_Y0 + stump_top) / 2
-        if line == "ON_THE_STUMPS":
-            ax.text((sxs[0] + sxs[1]) / 2, label_y, "On",
-                    ha="center", va="center", color=(1, 1, 1, 1.0),
-                    fontsize=18, fontweight="bold", rotation=90, zorder=6)
-            ax.text((sxs[1] + sxs[2]) / 2, label_y, "Stumps",
-                    ha="center", va="center", color=(1, 1, 1, 1.0),
-                    fontsize=18, fontweight="bold", rotation=90, zorder=6)
-        else:
-            ax.text(cx, label_y, label,
-                    ha="center", va="center", color=(1, 1, 1, 1.0),
-                    fontsize=18, fontweight="bold", rotation=90, zorder=6)
-
-        if no_data:
-            ax.text(cx, sr_y, "—", ha="center", va="center",
-                    color=(1, 1, 1, 0.25), fontsize=14, zorder=5)
-        else:
-            ax.text(cx, sr_y, f"SR {sr:.0f}",
-                    ha="center", va="center", color="white",
-                    fontsize=12, fontweight="bold", zorder=5)
-            ax.text(cx, con_y, f"Con {con:.0f}%",
-                    ha="center", va="center", color=(1, 1, 1, 0.85),
-                    fontsize=11, fontweight="bold", zorder=5)
-
-    _line_draw_stumps(ax, is_lhb=is_lhb)
-
-    ax.text(0.5, _ZONE_Y1 + 0.05, "Avg Bat (SR, Control%)", ha="center", va="bottom",
-            color="white", fontsize=11.5, fontweight="bold", zorder=5, clip_on=False)
-    plt.tight_layout()
+    fig, ax = _line_template(is_lhb, "avg", "Avg Bat (SR, Control%)")
+    _line_draw_neutral(ax, rows, is_lhb=is_lhb)
     return fig
 
 
@@ -2927,29 +4167,543 @@ def _pp_lighten(hex_color: str, factor: float = 0.3) -> str:
     return mcolors.to_hex((max(0, min(1, r)), max(0, min(1, g)), max(0, min(1, b))))
 
 
+# Decoded full-resolution logos, shared read-only across cards: {filename: RGBA array}
+_LOGO_CACHE = {}
+_LOGO_CACHE_LOCK = threading.Lock()
+
+
+def _resolve_asset(filename: str):
+    if os.path.exists(filename):
+        return filename
+    bundled = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    return bundled if os.path.exists(bundled) else None
+
+
+def _logo_array(filename: str):
+    """Logo decoded once at full resolution; scaling is left to OffsetImage zoom."""
+    arr = _LOGO_CACHE.get(filename)
+    if arr is not None:
+        return arr
+
+    path = _resolve_asset(filename) if filename else None
+    if path is None:
+        return None
+    arr = np.asarray(mpimg.imread(path))
+    arr.setflags(write=False)
+    with _LOGO_CACHE_LOCK:
+        arr = _LOGO_CACHE.setdefault(filename, arr)
+    return arr
+
+
+def preload_team_logos():
+    """Eagerly decode every IPL / WC team logo; returns the cache size."""
+    files = {m["logo"] for m in _TEAM_META_BY_ABBR.values()}
+    files |= {m["logo"] for m in _WC_TEAM_META_BY_ABBR.values()}
+    for filename in sorted(files):
+        _logo_array(filename)
+    return len(_LOGO_CACHE)
+
+
+if os.environ.get("CRICBIT_PRELOAD_LOGOS", "").lower() in ("1", "true", "yes"):
+    preload_team_logos()
+
+
 def _pp_load_logo(filename: str, target_h: int = 80):
-    if not filename or not os.path.exists(filename):
+    img = _logo_array(filename) if filename else None
+    if img is None:
         return None
-    img = mpimg.imread(filename)
     zoom = target_h / img.shape[0] if img.shape[0] > 0 else 0.3
     return OffsetImage(img, zoom=zoom)
 
 
-def _pp_load_player_image_from_url(image_url: str, target_h: int = 190):
-    """Download headshot from IPL CDN and return an OffsetImage, or None."""
-    if not image_url:
+class PlayerImageCache:
+    """
+    Two-tier headshot cache: an in-memory LRU of decoded RGBA arrays and an
+    on-disk store of the raw bytes keyed by URL hash.
+
+    Downloads go through one pooled requests.Session. Disk copies older than
+    max_age are revalidated with ETag / If-Modified-Since, and failed URLs are
+    negatively cached for negative_ttl seconds so one slow CDN response does
+    not stall every card.
+
+    Memory entries expire after max_age as well, and the LRU holds at most
+    max_items arrays. disk_dir is created on the first write; after each
+    download the oldest files are pruned to max_disk_items / max_disk_bytes.
+    """
+
+    def __init__(self, disk_dir=None, max_items=256, max_age=24 * 3600,
+                 negative_ttl=600, timeout=12, session=None,
+                 max_disk_items=2048, max_disk_bytes=256 * 1024 * 1024):
+        self.disk_dir = disk_dir
+        self.max_items = int(max_items)
+        self.max_age = max_age
+        self.max_disk_items = int(max_disk_items)
+        self.max_disk_bytes = int(max_disk_bytes)
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self._session = session
+        self._memory = OrderedDict()
+        self._failed = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.revalidated = 0
+        self.downloads = 0
+        self.negative_hits = 0
+
+    @property
+    def session(self):
+        if self._session is None:
+            sess = _req.Session()
+            adapter = _req.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=16)
+            sess.mount("http://", adapter)
+            sess.mount("https://", adapter)
+            self._session = sess
+        return self._session
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "revalidated": self.revalidated,
+                "downloads": self.downloads,
+                "negative_hits": self.negative_hits,
+                "entries": len(self._memory),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._failed.clear()
+
+    @staticmethod
+    def _decode(content: bytes):
+        from PIL import Image
+        img_pil = Image.open(io.BytesIO(content)).convert("RGBA")
+        arr = np.asarray(img_pil, dtype=np.float32) / 255.0
+        arr.setflags(write=False)
+        return arr
+
+    def _paths(self, url):
+        stem = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, stem + ".img"), os.path.join(self.disk_dir, stem + ".json")
+
+    def _read_disk(self, url):
+        if not self.disk_dir:
+            return None, None
+        img_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as fh:
+                meta = json.load(fh)
+            with open(img_path, "rb") as fh:
+                return fh.read(), meta
+        except (OSError, ValueError):
+            return None, None
+
+    def _write_disk(self, url, content, meta):
+        if not self.disk_dir:
+            return
+        img_path, meta_path = self._paths(url)
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            if content is not None:
+                with open(img_path + ".tmp", "wb") as fh:
+                    fh.write(content)
+                os.replace(img_path + ".tmp", img_path)
+            with open(meta_path + ".tmp", "w", encoding="utf-8") as fh:
+                json.dump(meta, fh)
+            os.replace(meta_path + ".tmp", meta_path)
+        except OSError:
+            pass
+
+    def _prune_disk(self):
+        """Drop the least recently fetched files beyond the disk limits."""
+        if not self.disk_dir:
+            return
+        try:
+            entries = []
+            with os.scandir(self.disk_dir) as it:
+                for ent in it:
+                    if ent.name.endswith(".img"):
+                        st = ent.stat()
+                        entries.append((st.st_mtime, st.st_size, ent.path))
+        except OSError:
+            return
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, path in entries:
+            if count <= self.max_disk_items and total <= self.max_disk_bytes:
+                break
+            for victim in (path, path[:-4] + ".json"):
+                try:
+                    os.remove(victim)
+                except OSError:
+                    pass
+            count -= 1
+            total -= size
+
+    def _remember(self, url, arr):
+        with self._lock:
+            self._memory[url] = (arr, time.time())
+            self._memory.move_to_end(url)
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+
+    def _fail(self, url):
+        with self._lock:
+            now = time.time()
+            if len(self._failed) >= self.max_items:
+                self._failed = {u: t for u, t in self._failed.items() if t > now}
+            self._failed[url] = now + self.negative_ttl
         return None
-    try:
-        resp = _req.get(image_url, timeout=12)
-        if resp.status_code != 200 or len(resp.content) < 500:
+
+    def get(self, url):
+        """Decoded RGBA array (float32, read-only) for url, or None."""
+        if not url:
             return None
-        from PIL import Image
-        img_pil = Image.open(io.BytesIO(resp.content)).convert("RGBA")
-        img_arr = np.array(img_pil) / 255.0
-        zoom = target_h / img_arr.shape[0] if img_arr.shape[0] > 0 else 0.3
-        return OffsetImage(img_arr, zoom=zoom)
-    except Exception:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(url)
+            if entry is not None:
+                if now - entry[1] < self.max_age:
+                    self._memory.move_to_end(url)
+                    self.hits += 1
+                    return entry[0]
+                del self._memory[url]
+            until = self._failed.get(url)
+            if until is not None:
+                if until > now:
+                    self.negative_hits += 1
+                    return None
+                del self._failed[url]
+
+        content, meta = self._read_disk(url)
+        if content is not None and now - meta.get("fetched_at", 0) < self.max_age:
+            try:
+                arr = self._decode(content)
+            except Exception:
+                content, meta = None, None
+            else:
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(url, arr)
+                return arr
+
+        headers = {}
+        if content is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            resp = self.session.get(url, timeout=self.timeout, headers=headers)
+        except Exception:
+            resp = None
+
+        if resp is not None and resp.status_code == 304 and content is not None:
+            meta["fetched_at"] = now
+            self._write_disk(url, None, meta)
+            with self._lock:
+                self.revalidated += 1
+        elif resp is not None and resp.status_code == 200 and len(resp.content) >= 500:
+            content = resp.content
+            meta = {
+                "url": url,
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "fetched_at": now,
+            }
+            with self._lock:
+                self.downloads += 1
+            try:
+                arr = self._decode(content)
+            except Exception:
+                return self._fail(url)
+            self._write_disk(url, content, meta)
+            self._prune_disk()
+            self._remember(url, arr)
+            return arr
+        elif content is None:
+            return self._fail(url)
+        # otherwise: revalidation failed, serve the stale disk copy
+
+        try:
+            arr = self._decode(content)
+        except Exception:
+            return self._fail(url)
+        self._remember(url, arr)
+        return arr
+
+
+player_image_cache = PlayerImageCache(
+    disk_dir=os.environ.get("CRICBIT_IMAGE_CACHE")
+    or os.path.join(os.path.expanduser("~"), ".cache", "cricbit", "headshots")
+)
+
+
+def _pp_load_player_image_from_url(image_url: str, target_h: int = 190):
+    """Fetch headshot (via player_image_cache) and return an OffsetImage, or None."""
+    img_arr = player_image_cache.get(image_url)
+    if img_arr is None:
         return None
+    zoom = target_h / img_arr.shape[0] if img_arr.shape[0] > 0 else 0.3
+    return OffsetImage(img_arr, zoom=zoom)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Player image index (players.csv → image_path, with a memory-mapped sidecar)
+# ─────────────────────────────────────────────────────────────────────────────
+
+_PLAYER_INDEX_MAGIC = b"PIDX1\0\0\0"
+_PLACEHOLDER_IMAGE = "placeholder.png"
+
+
+def normalize_player_name(name) -> str:
+    """Case-, accent- and whitespace-insensitive form of a player name."""
+    import unicodedata
+    text = unicodedata.normalize("NFKD", str(name or ""))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.replace("\u2019", "'").replace("\u2018", "'").replace("`", "'")
+    return " ".join(text.casefold().split())
+
+
+def _name_hash(norm: str) -> int:
+    import zlib
+    return zlib.crc32(norm.encode("utf-8"))
+
+
+def _name_trigrams(norm: str):
+    import zlib
+    padded = f"  {norm} "
+    return sorted({zlib.crc32(padded[i:i + 3].encode("utf-8")) for i in range(len(padded) - 2)})
+
+
+def _pack_strings(values):
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+class PlayerIndex:
+    """
+    Compact name index over players.csv (fullname, image_path).
+
+    Holds normalized names, an open-addressing hash table for O(1) exact
+    lookups, a sorted order for prefix search and trigram postings for fuzzy
+    matches. All arrays live in one binary sidecar that is memory-mapped on
+    load, so startup does not re-read the CSV.
+    """
+
+    _ARRAYS = ("names", "names_off", "raw", "raw_off", "paths", "paths_off",
+               "hashes", "table", "sorted_rows", "tri_keys", "tri_off", "tri_rows", "tri_count")
+
+    def __init__(self, arrays, meta):
+        self.meta = meta
+        for name in self._ARRAYS:
+            setattr(self, "_" + name, arrays[name])
+        self._mask = len(self._table) - 1
+
+    def __len__(self):
+        return len(self._hashes)
+
+    # ── construction ───────────────────────────────────────────────────────
+    @classmethod
+    def from_csv(cls, csv_path="players.csv"):
+        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+        raw_names = df["fullname"].tolist()
+        paths = df["image_path"].tolist()
+        norms = [normalize_player_name(n) for n in raw_names]
+
+        # one row per normalized name; a real headshot beats the CDN placeholder
+        keep = {}
+        for i, (norm, path) in enumerate(zip(norms, paths)):
+            if not norm:
+                continue
+            j = keep.get(norm)
+            if j is None or (_PLACEHOLDER_IMAGE in paths[j] and _PLACEHOLDER_IMAGE not in path):
+                keep[norm] = i
+        rows = sorted(keep.values())
+        norms = [norms[i] for i in rows]
+        raw_names = [raw_names[i] for i in rows]
+        paths = [paths[i] for i in rows]
+        n = len(rows)
+
+        hashes = np.array([_name_hash(v) for v in norms], dtype=np.uint32)
+        size = 1
+        while size < max(2 * n, 8):
+            size *= 2
+        table = np.full(size, -1, dtype=np.int32)
+        for row, h in enumerate(hashes.tolist()):
+            slot = h & (size - 1)
+            while table[slot] != -1:
+                slot = (slot + 1) & (size - 1)
+            table[slot] = row
+
+        tri_lists = [_name_trigrams(v) for v in norms]
+        tri_count = np.array([len(t) for t in tri_lists], dtype=np.int32)
+        flat_keys = np.fromiter((k for t in tri_lists for k in t), dtype=np.uint32, count=int(tri_count.sum()))
+        flat_rows = np.repeat(np.arange(n, dtype=np.int32), tri_count)
+        order = np.argsort(flat_keys, kind="stable")
+        flat_keys, flat_rows = flat_keys[order], flat_rows[order]
+        tri_keys, starts = np.unique(flat_keys, return_index=True)
+        tri_off = np.append(starts, len(flat_keys)).astype(np.int64)
+
+        names_blob, names_off = _pack_strings(norms)
+        raw_blob, raw_off = _pack_strings(raw_names)
+        paths_blob, paths_off = _pack_strings(paths)
+        arrays = {
+            "names": names_blob, "names_off": names_off,
+            "raw": raw_blob, "raw_off": raw_off,
+            "paths": paths_blob, "paths_off": paths_off,
+            "hashes": hashes, "table": table,
+            "sorted_rows": np.array(sorted(range(n), key=norms.__getitem__), dtype=np.int32),
+            "tri_keys": tri_keys.astype(np.uint32), "tri_off": tri_off,
+            "tri_rows": flat_rows, "tri_count": tri_count,
+        }
+        src_stat = os.stat(csv_path)
+        meta = {"source_size": src_stat.st_size, "source_mtime": src_stat.st_mtime, "rows": n}
+        return cls(arrays, meta)
+
+    def save(self, path):
+        layout, offset = {}, 0
+        for name in self._ARRAYS:
+            arr = np.ascontiguousarray(getattr(self, "_" + name))
+            offset = (offset + 7) & ~7
+            layout[name] = [arr.dtype.str, offset, int(arr.size)]
+            offset += arr.nbytes
+        header = json.dumps({"meta": self.meta, "arrays": layout}).encode("utf-8")
+        base = (len(_PLAYER_INDEX_MAGIC) + 8 + len(header) + 7) & ~7
+
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(_PLAYER_INDEX_MAGIC)
+            fh.write(np.uint64(len(header)).tobytes())
+            fh.write(header)
+            for name in self._ARRAYS:
+                arr = np.ascontiguousarray(getattr(self, "_" + name))
+                fh.write(b"\0" * (base + layout[name][1] - fh.tell()))
+                fh.write(arr.tobytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        mm = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(mm[:len(_PLAYER_INDEX_MAGIC)]) != _PLAYER_INDEX_MAGIC:
+            raise ValueError(f"{path} is not a player index sidecar")
+        pos = len(_PLAYER_INDEX_MAGIC)
+        header_len = int(np.frombuffer(mm[pos:pos + 8], dtype=np.uint64)[0])
+        header = json.loads(bytes(mm[pos + 8:pos + 8 + header_len]).decode("utf-8"))
+        base = (pos + 8 + header_len + 7) & ~7
+        arrays = {
+            name: np.frombuffer(mm, dtype=np.dtype(dt), count=count, offset=base + off)
+            for name, (dt, off, count) in header["arrays"].items()
+        }
+        return cls(arrays, header["meta"])
+
+    # ── lookups ────────────────────────────────────────────────────────────
+    @staticmethod
+    def _str(blob, offsets, row):
+        return bytes(blob[offsets[row]:offsets[row + 1]]).decode("utf-8")
+
+    def _row(self, record):
+        return {
+            "fullname": self._str(self._raw, self._raw_off, record),
+            "image_path": self._str(self._paths, self._paths_off, record),
+        }
+
+    def find(self, name):
+        """Row number for an exact (normalized) name match, or None."""
+        norm = normalize_player_name(name)
+        if not norm or not len(self._table):
+            return None
+        h = _name_hash(norm)
+        slot = h & self._mask
+        while True:
+            row = int(self._table[slot])
+            if row < 0:
+                return None
+            if int(self._hashes[row]) == h and self._str(self._names, self._names_off, row) == norm:
+                return row
+            slot = (slot + 1) & self._mask
+
+    def image_path(self, name):
+        """image_path for a player name, or None. O(1)."""
+        row = self.find(name)
+        return None if row is None else self._str(self._paths, self._paths_off, row)
+
+    def prefix(self, text, limit=10):
+        """Players whose normalized name starts with text, alphabetically."""
+        norm = normalize_player_name(text)
+        lo, hi = 0, len(self._sorted_rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._str(self._names, self._names_off, int(self._sorted_rows[mid])) < norm:
+                lo = mid + 1
+            else:
+                hi = mid
+        out = []
+        for i in range(lo, len(self._sorted_rows)):
+            row = int(self._sorted_rows[i])
+            if not self._str(self._names, self._names_off, row).startswith(norm) or len(out) >= limit:
+                break
+            out.append(self._row(row))
+        return out
+
+    def search(self, text, limit=5, min_score=0.3):
+        """Fuzzy matches by trigram Jaccard similarity, best first."""
+        norm = normalize_player_name(text)
+        if not norm or not len(self._tri_keys):
+            return []
+        q = np.array(_name_trigrams(norm), dtype=np.uint32)
+        pos = np.minimum(np.searchsorted(self._tri_keys, q), len(self._tri_keys) - 1)
+        pos = pos[self._tri_keys[pos] == q]
+        if not len(pos):
+            return []
+        postings = np.concatenate([self._tri_rows[self._tri_off[p]:self._tri_off[p + 1]] for p in pos])
+        cand, shared = np.unique(postings, return_counts=True)
+        score = shared / (len(q) + self._tri_count[cand] - shared)
+        keep = score >= min_score
+        cand, score = cand[keep], score[keep]
+        top = np.argsort(-score, kind="stable")[:limit]
+        return [dict(self._row(int(cand[i])), score=float(score[i])) for i in top]
+
+
+def load_player_index(csv_path="players.csv", sidecar=None):
+    """
+    Load the players.csv name index, memory-mapping the sidecar when it is
+    current and rebuilding (and re-saving) it when the CSV changed.
+    """
+    sidecar = sidecar or csv_path + ".idx"
+    src_stat = os.stat(csv_path)
+    if os.path.exists(sidecar):
+        try:
+            index = PlayerIndex.load(sidecar)
+            if (index.meta.get("source_size") == src_stat.st_size
+                    and index.meta.get("source_mtime") == src_stat.st_mtime):
+                return index
+        except (OSError, ValueError):
+            pass
+    index = PlayerIndex.from_csv(csv_path)
+    try:
+        index.save(sidecar)
+    except OSError:
+        pass
+    return index
+
+
+_PLAYER_INDEX = {}
+
+
+def player_image_url(name, csv_path="players.csv"):
+    """image_url for generate_player_profile_card from players.csv, or None."""
+    index = _PLAYER_INDEX.get(csv_path)
+    if index is None:
+        index = _PLAYER_INDEX[csv_path] = load_player_index(csv_path)
+    return index.image_path(name)
 
 
 def _pp_draw_stat_row(ax, x_left, y_center, bar_w, bar_h, value, max_val,
@@ -2993,6 +4747,126 @@ def _pp_draw_stat_row(ax, x_left, y_center, bar_w, bar_h, value, max_val,
             ha="left", va="center", family="sans-serif", zorder=5)
 
 
+_RANK_FIELDS = ("strike_factor", "control_factor", "composite_rank_score")
+
+
+def _rank_desc_min(values):
+    """1 + number of strictly larger values (pandas rank(ascending=False, method="min"))."""
+    ordered = np.sort(values)
+    return (len(values) - np.searchsorted(ordered, values, side="right") + 1).astype(np.int64)
+
+
+class RankingsIndex:
+    """
+    Pace or spin rankings with strike / control / overall ranks precomputed.
+
+    Built once from ranking rows (or wpaceranks/wspinranks CSVs); a profile
+    card then needs a single dict lookup. update() changes one player's
+    factors and shifts the affected ranks in O(n) without a full re-rank.
+    """
+
+    def __init__(self, names, strike, control, composite):
+        self.names = list(names)
+        self.factors = np.column_stack([
+            np.asarray(strike, dtype=float),
+            np.asarray(control, dtype=float),
+            np.asarray(composite, dtype=float),
+        ]).reshape(len(self.names), 3)
+        self.ranks = np.column_stack([_rank_desc_min(self.factors[:, j]) for j in range(3)]) \
+            .reshape(len(self.names), 3).astype(np.int64)
+        self.version = 0
+        self.row_of = {}
+        for i, name in enumerate(self.names):
+            if isinstance(name, str):
+                self.row_of.setdefault(name.strip(), i)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """rows: list of dicts with batter + _RANK_FIELDS; rows with missing factors are dropped."""
+        if not rows:
+            return cls([], [], [], [])
+        return cls._from_frame(pd.DataFrame(rows))
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls._from_frame(pd.read_csv(path))
+
+    @classmethod
+    def _from_frame(cls, df):
+        # non-string batters still count towards ranks and totals; they just cannot be looked up
+        for c in _RANK_FIELDS:
+            df[c] = pd.to_numeric(df[c], errors="coerce") if c in df else np.nan
+        df = df.dropna(subset=list(_RANK_FIELDS))
+        names = df["batter"].tolist() if "batter" in df else [None] * len(df)
+        return cls(names, *(df[c].to_numpy() for c in _RANK_FIELDS))
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, name):
+        """Card stats for a player, or None if unranked."""
+        i = self.row_of.get((name or "").strip())
+        if i is None:
+            return None
+        strike, control, composite = self.factors[i]
+        return {
+            "strike_factor": float(strike),
+            "control_factor": float(control),
+            "composite": float(composite),
+            "overall_rank": int(self.ranks[i, 2]),
+            "strike_rank": int(self.ranks[i, 0]),
+            "control_rank": int(self.ranks[i, 1]),
+        }
+
+    def update(self, name, strike_factor, control_factor, composite_rank_score):
+        """Set one player's factors (adding the player if new) and adjust every rank incrementally."""
+        new = np.array([strike_factor, control_factor, composite_rank_score], dtype=float)
+        if not np.all(np.isfinite(new)):
+            raise ValueError("ranking factors must be finite numbers")
+
+        key = name.strip()
+        i = self.row_of.get(key)
+        if i is None:
+            # a new player beats nobody yet: old value = -inf contributes to no rank
+            self.names.append(name)
+            self.factors = np.vstack([self.factors, np.full((1, 3), -np.inf)])
+            self.ranks = np.vstack([self.ranks, np.ones((1, 3), dtype=np.int64)])
+            i = len(self.names) - 1
+            self.row_of[key] = i
+
+        old = self.factors[i].copy()
+        others = np.ones(len(self.names), dtype=bool)
+        others[i] = False
+        # rank_j = 1 + #{k: x_k > x_j}; only player i's term changes for everyone else
+        delta = (new[None, :] > self.factors).astype(np.int64) - (old[None, :] > self.factors)
+        self.ranks[others] += delta[others]
+        self.factors[i] = new
+        self.ranks[i] = 1 + (self.factors[others] > new[None, :]).sum(axis=0)
+        self.version += 1
+
+    def render_token(self):
+        """Content that determines a rendered card (used by render_key)."""
+        return ("RankingsIndex", self.version, self.names, self.factors)
+
+
+_RANKINGS_CACHE = {}
+
+
+def load_rankings_index(path):
+    """RankingsIndex for a rankings CSV (e.g. wpaceranks_w_t20.csv), built once per file version."""
+    mtime = os.path.getmtime(path)
+    cached = _RANKINGS_CACHE.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = _RANKINGS_CACHE[path] = (mtime, RankingsIndex.from_csv(path))
+    return cached[1]
+
+
+def _as_rankings_index(rankings):
+    if isinstance(rankings, RankingsIndex):
+        return rankings
+    return RankingsIndex.from_rows(rankings)
+
+
 def generate_player_profile_card(
     player_name: str,
     pace_rankings: list,
@@ -3007,8 +4881,9 @@ def generate_player_profile_card(
     Parameters
     ----------
     player_name : str
-    pace_rankings : list of dicts with batter, strike_factor, control_factor, composite_rank_score
-    spin_rankings : list of dicts with same keys
+    pace_rankings : list of dicts with batter, strike_factor, control_factor, composite_rank_score,
+                    or a prebuilt RankingsIndex
+    spin_rankings : list of dicts with same keys, or a RankingsIndex
     image_url : str or None  – IPL CDN headshot URL
     team_abbr : str or None  – e.g. "CSK", "MI"
 
@@ -3017,42 +4892,13 @@ def generate_player_profile_card(
     matplotlib Figure or None if player not found in any ranking.
     """
 
-    # Build ranked DataFrames
-    def _build_ranked(rows):
-        if not rows:
-            return pd.DataFrame()
-        df = pd.DataFrame(rows)
-        for c in ("strike_factor", "control_factor", "composite_rank_score"):
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-        df = df.dropna(subset=["strike_factor", "control_factor", "composite_rank_score"])
-        df["overall_rank"] = df["composite_rank_score"].rank(ascending=False, method="min").astype(int)
-        df["strike_rank"] = df["strike_factor"].rank(ascending=False, method="min").astype(int)
-        df["control_rank"] = df["control_factor"].rank(ascending=False, method="min").astype(int)
-        return df
-
-    pace_df = _build_ranked(pace_rankings)
-    spin_df = _build_ranked(spin_rankings)
-
-    def _extract(df, name):
-        if df.empty:
-            return None
-        row = df[df["batter"].str.strip() == name.strip()]
-        if row.empty:
-            return None
-        r = row.iloc[0]
-        return {
-            "strike_factor": float(r["strike_factor"]),
-            "control_factor": float(r["control_factor"]),
-            "composite": float(r["composite_rank_score"]),
-            "overall_rank": int(r["overall_rank"]),
-            "strike_rank": int(r["strike_rank"]),
-            "control_rank": int(r["control_rank"]),
-        }
+    pace_index = _as_rankings_index(pace_rankings)
+    spin_index = _as_rankings_index(spin_rankings)
 
-    pace = _extract(pace_df, player_name)
-    spin = _extract(spin_df, player_name)
-    pace_total = len(pace_df) if not pace_df.empty else 0
-    spin_total = len(spin_df) if not spin_df.empty else 0
+    pace = pace_index.lookup(player_name)
+    spin = spin_index.lookup(player_name)
+    pace_total = len(pace_index)
+    spin_total = len(spin_index)
 
     if pace is None and spin is None:
         return None
@@ -3215,3 +5061,278 @@ def generate_player_profile_card(
     return fig
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Render cache (content-addressed PNG/SVG bytes for plot_* / create_* builders)
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Bump when rendering changes in a way the builder source hash cannot see
+# (matplotlib upgrade, fonts, assets)
+RENDER_CACHE_VERSION = 1
+
+_HASHABLE_SCALARS = (str, int, float, bool, complex, bytes, type(None), np.generic)
+_MODULE_SOURCE_HASHES = {}
+
+
+def _hash_update(h, obj):
+    """
+    Feed a stable byte encoding of a chart input into hashlib object h.
+
+    Objects outside the known container / scalar types must expose
+    render_token() returning hashable content; anything else raises
+    TypeError rather than falling back to an identity-based repr.
+    """
+    if isinstance(obj, pd.DataFrame):
+        h.update(b"df")
+        _hash_update(h, [str(c) for c in obj.columns])
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, pd.Series):
+        h.update(b"series")
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(f"nd{obj.dtype.str}{obj.shape}".encode())
+        if obj.dtype == object:
+            _hash_update(h, obj.tolist())
+        else:
+            h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for k, v in sorted(obj.items(), key=lambda kv: repr(kv[0])):
+            _hash_update(h, k)
+            _hash_update(h, v)
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[" if isinstance(obj, list) else b"(")
+        for v in obj:
+            _hash_update(h, v)
+        h.update(b"]")
+    elif isinstance(obj, (set, frozenset)):
+        _hash_update(h, sorted(obj, key=repr))
+    elif isinstance(obj, _HASHABLE_SCALARS):
+        h.update(f"{type(obj).__name__}:{obj!r};".encode())
+    elif callable(getattr(obj, "render_token", None)):
+        h.update(f"tok:{type(obj).__qualname__}".encode())
+        _hash_update(h, obj.render_token())
+    else:
+        raise TypeError(f"cannot build a render key from {type(obj).__name__}")
+
+
+def _module_source_hash(module_name):
+    """sha256 of a builder module's source file, so edited builders miss the disk cache."""
+    digest = _MODULE_SOURCE_HASHES.get(module_name)
+    if digest is None:
+        path = getattr(sys.modules.get(module_name), "__file__", None)
+        try:
+            with open(path, "rb") as fh:
+                digest = hashlib.sha256(fh.read()).hexdigest()
+        except (OSError, TypeError):
+            digest = "unknown"
+        _MODULE_SOURCE_HASHES[module_name] = digest
+    return digest
+
+
+def render_key(func, args=(), kwargs=None, fmt="png", savefig_kwargs=None) -> str:
+    """
+    Content hash of a chart builder call: cache version, builder source,
+    function, inputs, style kwargs and output format. Raises TypeError for
+    inputs without a content encoding.
+    """
+    h = hashlib.sha256()
+    _hash_update(h, RENDER_CACHE_VERSION)
+    _hash_update(h, _module_source_hash(func.__module__))
+    _hash_update(h, f"{func.__module__}.{func.__qualname__}")
+    _hash_update(h, list(args))
+    _hash_update(h, kwargs or {})
+    _hash_update(h, fmt)
+    _hash_update(h, savefig_kwargs or {})
+    return h.hexdigest()
+
+
+def _extras_to_json(obj):
+    """Tagged JSON form of render extras (dict keys keep their type); TypeError if not representable."""
+    if obj is None or isinstance(obj, (bool, str)):
+        return obj
+    if isinstance(obj, (int, float, np.integer, np.floating)):
+        v = obj.item() if isinstance(obj, np.generic) else obj
+        if isinstance(v, float) and not np.isfinite(v):
+            return {"f": repr(v)}
+        return v
+    if isinstance(obj, dict):
+        return {"d": [[_extras_to_json(k), _extras_to_json(v)] for k, v in obj.items()]}
+    if isinstance(obj, tuple):
+        return {"t": [_extras_to_json(v) for v in obj]}
+    if isinstance(obj, list):
+        return [_extras_to_json(v) for v in obj]
+    raise TypeError(f"cannot store {type(obj).__name__} in the render cache")
+
+
+def _extras_from_json(obj):
+    if isinstance(obj, list):
+        return [_extras_from_json(v) for v in obj]
+    if isinstance(obj, dict):
+        if "d" in obj:
+            return {_extras_from_json(k): _extras_from_json(v) for k, v in obj["d"]}
+        if "t" in obj:
+            return tuple(_extras_from_json(v) for v in obj["t"])
+        if "f" in obj:
+            return float(obj["f"])
+        raise ValueError("unknown render cache tag")
+    return obj
+
+
+class RenderCache:
+    """
+    LRU of rendered chart bytes with a memory budget and an optional on-disk tier.
+
+    Entries are (image_bytes, extras) where extras holds any non-figure return
+    values (e.g. the fielder labels from plot_field_setting). On disk each
+    entry is the raw image ({key}.img) plus its extras as tagged JSON
+    ({key}.json); nothing is unpickled, so a shared cache directory cannot
+    inject code. Extras that JSON cannot represent stay memory-only.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, disk_dir=None):
+        self.max_bytes = int(max_bytes)
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _disk_path(self, key, ext):
+        return os.path.join(self.disk_dir, f"{key}.{ext}")
+
+    def _read_disk(self, key):
+        try:
+            with open(self._disk_path(key, "json"), "r", encoding="utf-8") as fh:
+                extras = _extras_from_json(json.load(fh))
+            with open(self._disk_path(key, "img"), "rb") as fh:
+                image_bytes = fh.read()
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+        if not isinstance(extras, tuple):
+            return None
+        return image_bytes, extras
+
+    def _write_disk(self, key, entry):
+        try:
+            extras = json.dumps(_extras_to_json(entry[1]))
+        except (TypeError, ValueError):
+            return
+        # extras first: an .img on disk always has its .json beside it
+        for ext, data, mode in (("json", extras, "w"), ("img", entry[0], "wb")):
+            path = self._disk_path(key, ext)
+            tmp = path + ".tmp"
+            try:
+                with open(tmp, mode, **({"encoding": "utf-8"} if mode == "w" else {})) as fh:
+                    fh.write(data)
+                os.replace(tmp, path)
+            except OSError:
+                return
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        if self.disk_dir:
+            entry = self._read_disk(key)
+            if entry is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._put_memory(key, entry)
+                return entry
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, image_bytes, extras=()):
+        entry = (image_bytes, tuple(extras))
+        self._put_memory(key, entry)
+        if self.disk_dir:
+            self._write_disk(key, entry)
+        return entry
+
+    def _put_memory(self, key, entry):
+        size = len(entry[0])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old[0])
+            self._entries[key] = entry
+            self._size += size
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted[0])
+                self.evictions += 1
+
+
+render_cache = RenderCache()
+
+
+def render_cached(func, *args, fmt="png", dpi=150, savefig_kwargs=None, cache=None, **kwargs):
+    """
+    Call a plot_* / create_* builder and return (image_bytes, extras), serving
+    repeat calls with identical inputs and style kwargs from the render cache
+    without touching matplotlib.
+
+    extras is a tuple of the builder's non-figure return values (empty for
+    builders returning a bare figure). Returns (None, ()) when the builder
+    returns no figure; failures are not cached, and calls whose inputs have no
+    content encoding (see _hash_update) are rendered without the cache.
+    """
+    cache = render_cache if cache is None else cache
+    save_opts = {"dpi": dpi, "bbox_inches": "tight"}
+    save_opts.update(savefig_kwargs or {})
+
+    try:
+        key = render_key(func, args, kwargs, fmt, save_opts)
+    except TypeError:
+        key = None          # inputs without a content encoding: render uncached
+    entry = cache.get(key) if key is not None else None
+    if entry is not None:
+        return entry
+
+    result = func(*args, **kwargs)
+    if isinstance(result, tuple):
+        fig, extras = result[0], result[1:]
+    else:
+        fig, extras = result, ()
+    if fig is None:
+        return None, ()
+
+    buf = io.BytesIO()
+    try:
+        fig.savefig(buf, format=fmt, **save_opts)
+    finally:
+        plt.close(fig)
+    if key is None:
+        return buf.getvalue(), tuple(extras)
+    return cache.put(key, buf.getvalue(), extras)
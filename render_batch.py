@@ -0,0 +1,186 @@
+"""
+Headless bulk renderer for squad-wide chart reports.
+
+Usage:
+    python render_batch.py PAYLOAD_DIR OUT_DIR [--batters NAME ...] [--workers N]
+
+PAYLOAD_DIR holds one JSON file per batter:
+
+    {
+      "batter": "V Kohli",
+      "charts": {
+        "plot_int_wagons":      {"batter": "V Kohli", "lengths": [...], ...},
+        "plot_matchups_chart": [{...kwargs...}, {...kwargs...}]
+      }
+    }
+
+Each chart entry is the keyword arguments of the matching functions.py
+builder (or a list of them for several variants). Charts are rendered with
+the Agg backend across a process pool; OUT_DIR receives one folder of PNGs
+per batter plus manifest.json.
+"""
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use("Agg")
+
+
+CHARTS = (
+    "plot_int_wagons",
+    "plot_matchups_chart",
+    "plot_variations_chart",
+    "plot_intent_impact",
+    "plot_field_setting",
+    "plot_sector_ev_heatmap",
+    "create_zone_strength_table",
+    "create_shot_profile_chart",
+    "create_similarity_chart",
+    "create_feature_group_breakdown",
+    "create_weakness_tiles",
+    "plot_intrel_pitch",
+    "plot_intrel_pitch_avg",
+    "plot_intrel_pitch_batter",
+    "plot_line_intrel_pitch",
+    "plot_line_intrel_pitch_batter",
+    "plot_line_intrel_pitch_avg",
+    "generate_player_profile_card",
+)
+
+_worker_cache = None
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", str(name)).strip("_") or "unnamed"
+
+
+def _to_frames(chart: str, kwargs: dict) -> dict:
+    """JSON cannot carry DataFrames; rebuild the ones the builders expect."""
+    import pandas as pd
+
+    kwargs = dict(kwargs)
+    if chart == "plot_sector_ev_heatmap" and isinstance(kwargs.get("ev_dict"), dict):
+        kwargs["ev_dict"] = {
+            ln: (pd.DataFrame(rows) if rows is not None else None)
+            for ln, rows in kwargs["ev_dict"].items()
+        }
+    if chart == "create_similarity_chart" and kwargs.get("sim_df") is not None:
+        kwargs["sim_df"] = pd.DataFrame(kwargs["sim_df"])
+    return kwargs
+
+
+def load_payloads(payload_dir: str, batters=None) -> dict:
+    """Return {batter: {chart: [kwargs, ...]}} for the requested batters (all if None)."""
+    payloads = {}
+    for fname in sorted(os.listdir(payload_dir)):
+        if not fname.endswith(".json"):
+            continue
+        with open(os.path.join(payload_dir, fname), encoding="utf-8") as fh:
+            doc = json.load(fh)
+        batter = doc.get("batter") or os.path.splitext(fname)[0]
+        charts = {}
+        for chart, spec in (doc.get("charts") or {}).items():
+            if chart not in CHARTS:
+                raise ValueError(f"{fname}: unknown chart '{chart}'")
+            charts[chart] = spec if isinstance(spec, list) else [spec]
+        payloads[batter] = charts
+
+    if batters:
+        missing = [b for b in batters if b not in payloads]
+        if missing:
+            raise ValueError(f"No payload for batters: {', '.join(missing)}")
+        payloads = {b: payloads[b] for b in batters}
+    return payloads
+
+
+def _init_worker(cache_dir):
+    global _worker_cache
+    import functions
+    _worker_cache = functions.RenderCache(disk_dir=cache_dir) if cache_dir else functions.render_cache
+
+
+def _render_one(task):
+    import functions
+
+    batter, chart, variant, kwargs, out_path, dpi = task
+    started = time.perf_counter()
+    record = {"batter": batter, "chart": chart, "variant": variant, "path": None}
+    try:
+        image, _ = functions.render_cached(
+            getattr(functions, chart), dpi=dpi, cache=_worker_cache,
+            **_to_frames(chart, kwargs),
+        )
+        if image is None:
+            record["status"] = "empty"
+        else:
+            with open(out_path, "wb") as fh:
+                fh.write(image)
+            record["status"] = "ok"
+            record["path"] = out_path
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = round(time.perf_counter() - started, 4)
+    return record
+
+
+def render_batch(payload_dir, out_dir, batters=None, workers=None, dpi=150, cache_dir=None) -> dict:
+    """Render every chart for every batter and write OUT_DIR/manifest.json; returns the manifest."""
+    payloads = load_payloads(payload_dir, batters)
+    os.makedirs(out_dir, exist_ok=True)
+
+    tasks = []
+    for batter, charts in payloads.items():
+        bat_dir = os.path.join(out_dir, _slug(batter))
+        os.makedirs(bat_dir, exist_ok=True)
+        for chart, variants in charts.items():
+            for i, kwargs in enumerate(variants):
+                suffix = f"_{i + 1}" if len(variants) > 1 else ""
+                out_path = os.path.join(bat_dir, f"{chart}{suffix}.png")
+                tasks.append((batter, chart, i, kwargs, out_path, dpi))
+
+    started = time.perf_counter()
+    records = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cache_dir,)) as pool:
+        futures = [pool.submit(_render_one, t) for t in tasks]
+        for fut in as_completed(futures):
+            records.append(fut.result())
+
+    records.sort(key=lambda r: (r["batter"], r["chart"], r["variant"]))
+    manifest = {
+        "payload_dir": os.path.abspath(payload_dir),
+        "batters": list(payloads),
+        "charts": records,
+        "rendered": sum(r["status"] == "ok" for r in records),
+        "failed": sum(r["status"] == "error" for r in records),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render every chart for a list of batters without Streamlit.")
+    parser.add_argument("payload_dir", help="directory of per-batter JSON payloads")
+    parser.add_argument("out_dir", help="directory for PNGs and manifest.json")
+    parser.add_argument("--batters", nargs="*", default=None, help="batters to render (default: all payloads)")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument("--dpi", type=int, default=150)
+    parser.add_argument("--cache-dir", default=None, help="optional on-disk render cache shared across runs (raw images + JSON, never unpickled)")
+    args = parser.parse_args(argv)
+
+    manifest = render_batch(args.payload_dir, args.out_dir, args.batters,
+                            workers=args.workers, dpi=args.dpi, cache_dir=args.cache_dir)
+    print(f"{manifest['rendered']} charts rendered, {manifest['failed']} failed "
+          f"in {manifest['seconds']}s → {os.path.join(args.out_dir, 'manifest.json')}")
+    return 1 if manifest["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,45 @@
+import os
+import sys
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functions import build_matchup_table
+
+
+def test_invalid_balls_count_as_zero():
+    payloads = {
+        "A": {"matchups": {
+            "pace": {"balls": None, "sr": 120.0},
+            "spin": {"balls": float("nan"), "sr": 95.0},
+            "left": {"balls": "n/a", "sr": 80.0},
+            "right": {"balls": "42", "sr": 130.0},
+        }},
+    }
+    table = build_matchup_table(payloads)
+
+    row = table["row_of"]["A"]
+    balls = {key: table["balls"][row, table["col_of"][("matchups", key)]]
+             for key in ("pace", "spin", "left", "right")}
+    assert balls == {"pace": 0, "spin": 0, "left": 0, "right": 42}
+    assert table["present"][row].all()
+
+    sr = table["values"][row, :, table["metrics"].index("sr")]
+    assert np.allclose(sr, [120.0, 95.0, 80.0, 130.0])
+
+
+def test_missing_balls_and_variations():
+    table = build_matchup_table(
+        {"A": {"matchups": {"pace": {"sr": 100.0}}}},
+        {"B": {"variations": {"yorker": {"balls": 12, "sr": 60.0}}}},
+    )
+
+    assert table["batters"] == ["A", "B"]
+    assert table["balls"][table["row_of"]["A"], table["col_of"][("matchups", "pace")]] == 0
+    assert table["balls"][table["row_of"]["B"], table["col_of"][("variations", "yorker")]] == 12
+    assert not table["present"][table["row_of"]["A"], table["col_of"][("variations", "yorker")]]